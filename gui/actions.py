@@ -1,63 +1,151 @@
-from typing import List, Optional, Callable
-from models.graph import GraphState
+from collections import deque
+from itertools import islice
+from typing import Deque, Optional, Callable
+from weakref import WeakValueDictionary
 
-class UndoRedoManager:
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from models.graph import GraphState, GraphEdit
+
+class UndoRedoManager(QObject):
     """
     Manages undo/redo operations for graph editing.
+    History entries are GraphEdit deltas; every checkpoint_interval edits a
+    full snapshot (taken via the snapshot callable) is attached for recovery.
+
+    Signals:
+        state_changed: Emitted when undo/redo availability may have changed
     """
+    state_changed = pyqtSignal()
+
+    # Edit kinds that change the graph and belong in the history
+    UNDOABLE_KINDS = frozenset({"add_node", "move_node", "add_edge", "delete_nodes", "clear"})
     
-    def __init__(self, max_history: int = 50):
+    def __init__(self, max_history: int = 50, checkpoint_interval: int = 10,
+                 snapshot: Optional[Callable[[], GraphState]] = None, parent=None):
+        super().__init__(parent)
         self.max_history = max_history
-        self._undo_stack: List[GraphState] = []
-        self._redo_stack: List[GraphState] = []
-        self._on_change_callbacks: List[Callable[[], None]] = []
+        self.checkpoint_interval = checkpoint_interval
+        self._snapshot = snapshot
+        self._edits_since_checkpoint = 0
+        self._undo_stack: Deque[GraphEdit] = deque(maxlen=max_history)
+        self._redo_stack: Deque[GraphEdit] = deque(maxlen=max_history)
+        # Full states held by the history, deduplicated by content
+        self._states: 'WeakValueDictionary[int, GraphState]' = WeakValueDictionary()
         
-    def save_state(self, state: GraphState):
+    def record_edit(self, edit: GraphEdit) -> bool:
         """
-        Save current state for potential undo.
+        Record an edit that has just been applied.
         Clears redo stack (new action invalidates redo history).
+        Edits whose forward and inverse operations are equal change nothing
+        and are skipped. Returns True if the edit was recorded.
         """
-        # Add copy to undo stack
-        self._undo_stack.append(state.copy())
-        
-        # Limit stack size
-        if len(self._undo_stack) > self.max_history:
-            self._undo_stack.pop(0)
+        if edit.kind not in self.UNDOABLE_KINDS:
+            raise ValueError(f"Edit kind {edit.kind!r} is not undoable")
+        if edit.forward == edit.inverse:
+            return False
+
+        if edit.checkpoint is not None:
+            # Edit already carries a full state
+            self._edits_since_checkpoint = 0
+        else:
+            self._edits_since_checkpoint += 1
+            if self._snapshot is not None and self._edits_since_checkpoint >= self.checkpoint_interval:
+                edit.checkpoint = self._snapshot()
+                self._edits_since_checkpoint = 0
+        if edit.checkpoint is not None:
+            edit.checkpoint = self._intern_state(edit.checkpoint)
+
+        # Oldest entry is evicted once max_history is reached
+        self._undo_stack.append(edit)
             
         # Clear redo stack
         self._redo_stack.clear()
         
         self._notify_change()
+        return True
         
+    def save_delta(self, kind: str, forward: tuple, inverse: tuple) -> bool:
+        """Record a small edit as its forward/inverse operations."""
+        return self.record_edit(GraphEdit(kind, forward, inverse))
+
+    def save_snapshot(self, kind: str, before: GraphState, after: GraphState) -> bool:
+        """
+        Record an edit that replaces the whole graph.
+        The after state doubles as the recovery checkpoint, so no extra
+        snapshot is taken for it.
+        """
+        before = self._intern_state(before)
+        after = self._intern_state(after)
+        return self.record_edit(GraphEdit(
+            kind, ("restore", after), ("restore", before), checkpoint=after
+        ))
+
+    def _intern_state(self, state: GraphState) -> GraphState:
+        """Return an equal state already held by the history, or register this one."""
+        key = hash(state)
+        existing = self._states.get(key)
+        if existing is not None and existing == state:
+            return existing
+        self._states[key] = state
+        return state
+
     def undo(self, current_state: GraphState) -> Optional[GraphState]:
         """
-        Undo the last action.
+        Undo the last action by applying its inverse to current_state.
         """
         if not self.can_undo():
             return None
             
-        # Save current state to redo
-        self._redo_stack.append(current_state.copy())
-        
-        # Pop and return previous state
-        state = self._undo_stack.pop()
+        edit = self._undo_stack.pop()
+        try:
+            current_state.apply(edit.inverse)
+        except ValueError:
+            recovered = self._rebuild_state(len(self._undo_stack) - 1)
+            if recovered is None:
+                self._undo_stack.append(edit)
+                raise
+            current_state = recovered
+
+        self._redo_stack.append(edit)
         self._notify_change()
-        return state
+        return current_state
         
     def redo(self, current_state: GraphState) -> Optional[GraphState]:
         """
-        Redo a previously undone action.
+        Redo a previously undone action by applying it to current_state.
         """
         if not self.can_redo():
             return None
             
-        # Save current state to undo
-        self._undo_stack.append(current_state.copy())
-        
-        # Pop and return redo state
-        state = self._redo_stack.pop()
+        edit = self._redo_stack.pop()
+        self._undo_stack.append(edit)
+        try:
+            current_state.apply(edit.forward)
+        except ValueError:
+            recovered = self._rebuild_state(len(self._undo_stack) - 1)
+            if recovered is None:
+                self._undo_stack.pop()
+                self._redo_stack.append(edit)
+                raise
+            current_state = recovered
+
         self._notify_change()
-        return state
+        return current_state
+
+    def _rebuild_state(self, index: int) -> Optional[GraphState]:
+        """
+        Rebuild the state right after undo_stack[index] from the nearest
+        checkpoint at or before it. Returns None if no checkpoint is available.
+        """
+        for i in range(index, -1, -1):
+            checkpoint = self._undo_stack[i].checkpoint
+            if checkpoint is not None:
+                state = checkpoint.copy()
+                for edit in islice(self._undo_stack, i + 1, index + 1):
+                    state.apply(edit.forward)
+                return state
+        return None
         
     def can_undo(self) -> bool:
         """Check if undo is available."""
@@ -71,24 +159,23 @@ class UndoRedoManager:
         """Clear all history."""
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._edits_since_checkpoint = 0
         self._notify_change()
         
     def add_change_callback(self, callback: Callable[[], None]):
         """Add a callback to be called when undo/redo availability changes."""
-        self._on_change_callbacks.append(callback)
+        self.state_changed.connect(callback)
         
     def remove_change_callback(self, callback: Callable[[], None]):
         """Remove a previously added callback."""
-        if callback in self._on_change_callbacks:
-            self._on_change_callbacks.remove(callback)
+        try:
+            self.state_changed.disconnect(callback)
+        except TypeError:
+            pass  # Was not connected
             
     def _notify_change(self):
-        """Notify all callbacks of state change."""
-        for callback in self._on_change_callbacks:
-            try:
-                callback()
-            except Exception:
-                pass  
+        """Notify listeners of state change."""
+        self.state_changed.emit()
                 
     @property
     def undo_count(self) -> int:
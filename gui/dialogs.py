@@ -2,17 +2,65 @@ from PyQt5.QtWidgets import QDialog, QVBoxLayout, QPlainTextEdit, QLabel, QPushB
 from PyQt5.QtGui import (
     QFont, QColor, QTextCharFormat, QSyntaxHighlighter, QFontDatabase
 )
-from PyQt5.QtCore import QRegularExpression, Qt, pyqtSignal
+from PyQt5.QtCore import QRegularExpression, Qt, pyqtSignal, QTimer
 from typing import List
 
 
 class CodeViewerDialog(QDialog):
 
     class _CSyntaxHighlighter(QSyntaxHighlighter):
+        # (pattern, format) pairs shared by all instances, built on first use
+        _RULES = None
+
+        # Blocks highlighted per event-loop turn; the first chunk is done synchronously
+        CHUNK_BLOCKS = 200
+
         def __init__(self, document):
             super().__init__(document)
-
-            self.rules = []
+            cls = type(self)
+            if cls._RULES is None:
+                cls._RULES = cls._build_rules()
+            self.rules = cls._RULES
+
+            # Blocks numbered >= _deferred_from are left for the chunk timer
+            self._deferred_from = None
+            self._chunk_timer = QTimer(self)
+            self._chunk_timer.setSingleShot(True)
+            self._chunk_timer.setInterval(0)
+            self._chunk_timer.timeout.connect(self._highlight_next_chunk)
+
+        def defer_highlighting(self):
+            """
+            Highlight only the first chunk when the document text is replaced next;
+            the remaining blocks are highlighted in chunks from the event loop.
+            """
+            self._chunk_timer.stop()
+            self._deferred_from = self.CHUNK_BLOCKS
+
+        def resume_highlighting(self):
+            """Start highlighting deferred blocks in chunks."""
+            if self._deferred_from is not None:
+                self._chunk_timer.start()
+
+        def _highlight_next_chunk(self):
+            doc = self.document()
+            if doc is None or self._deferred_from is None:
+                return
+            start = self._deferred_from
+            end = start + self.CHUNK_BLOCKS
+            self._deferred_from = end
+            block = doc.findBlockByNumber(start)
+            while block.isValid() and block.blockNumber() < end:
+                self.rehighlightBlock(block)
+                block = block.next()
+            if end >= doc.blockCount():
+                self._deferred_from = None
+            else:
+                self._chunk_timer.start()
+
+        @classmethod
+        def _build_rules(cls):
+            rules = []
 
             # ===== C / KLEE keywords =====
             keyword_format = QTextCharFormat()
@@ -24,16 +72,16 @@ class CodeViewerDialog(QDialog):
                 "klee_make_symbolic", "klee_assume", "klee_print_expr"
             ]
 
-            for kw in keywords:
-                self.rules.append((
-                    QRegularExpression(rf"\b{kw}\b"),
-                    keyword_format
-                ))
+            # One alternation per format - a single scan per block
+            rules.append((
+                QRegularExpression(rf"\b(?:{'|'.join(keywords)})\b"),
+                keyword_format
+            ))
 
             # ===== Preprocessor (#include, #define) =====
             preproc_format = QTextCharFormat()
             preproc_format.setForeground(QColor("#C586C0"))
-            self.rules.append((
+            rules.append((
                 QRegularExpression(r"^\s*#\w+.*"),
                 preproc_format
             ))
@@ -43,16 +91,15 @@ class CodeViewerDialog(QDialog):
             macro_format.setForeground(QColor("#4EC9B0"))
 
             macros = ["NODES", "COLORS", "EDGES", "BLOCKED"]
-            for m in macros:
-                self.rules.append((
-                    QRegularExpression(rf"\b{m}\b"),
-                    macro_format
-                ))
+            rules.append((
+                QRegularExpression(rf"\b(?:{'|'.join(macros)})\b"),
+                macro_format
+            ))
 
             # ===== Numbers =====
             number_format = QTextCharFormat()
             number_format.setForeground(QColor("#B5CEA8"))
-            self.rules.append((
+            rules.append((
                 QRegularExpression(r"\b\d+\b"),
                 number_format
             ))
@@ -60,7 +107,7 @@ class CodeViewerDialog(QDialog):
             # ===== Strings =====
             string_format = QTextCharFormat()
             string_format.setForeground(QColor("#CE9178"))
-            self.rules.append((
+            rules.append((
                 QRegularExpression(r'"[^"]*"'),
                 string_format
             ))
@@ -68,12 +115,20 @@ class CodeViewerDialog(QDialog):
             # ===== Comments =====
             comment_format = QTextCharFormat()
             comment_format.setForeground(QColor("#6A9955"))
-            self.rules.append((
+            rules.append((
                 QRegularExpression(r"//[^\n]*"),
                 comment_format
             ))
 
+            # Compile patterns up front instead of on first match
+            for pattern, _ in rules:
+                pattern.optimize()
+
+            return rules
+
         def highlightBlock(self, text):
+            if self._deferred_from is not None and self.currentBlock().blockNumber() >= self._deferred_from:
+                return
             for pattern, fmt in self.rules:
                 it = pattern.globalMatch(text)
                 while it.hasNext():
@@ -94,7 +149,8 @@ class CodeViewerDialog(QDialog):
         self.setModal(False)
         self.setWindowModality(Qt.NonModal)
 
-        self.setAttribute(Qt.WA_DeleteOnClose, True)
+        # Kept alive and reused by the main window; closing only hides it
+        self.setAttribute(Qt.WA_DeleteOnClose, False)
 
         layout = QVBoxLayout(self)
 
@@ -130,5 +186,7 @@ class CodeViewerDialog(QDialog):
         sb = self.editor.verticalScrollBar()
         old_scroll = sb.value()
 
+        self._highlighter.defer_highlighting()
         self.editor.setPlainText(code)
+        self._highlighter.resume_highlighting()
         sb.setValue(old_scroll)
\ No newline at end of file
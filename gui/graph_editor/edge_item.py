@@ -1,9 +1,16 @@
-from PyQt5.QtWidgets import QGraphicsLineItem
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsLineItem
 from PyQt5.QtCore import Qt, QPointF
 from PyQt5.QtGui import QPen
 
 from models.graph import Edge
-from models.settings import EDGE_WIDTH, Theme
+from models.settings import EDGE_WIDTH, HIGHLIGHT_EDGE_WIDTH, Theme
+
+# Shared edge pens (QPen is implicitly shared, items only hold a reference)
+PEN_DEFAULT = QPen(Theme.EDGE_DEFAULT, EDGE_WIDTH, Qt.SolidLine, Qt.RoundCap)
+PEN_HIGHLIGHT = QPen(Theme.ACCENT_ERROR, HIGHLIGHT_EDGE_WIDTH, Qt.SolidLine, Qt.RoundCap)
+PEN_ERROR = QPen(Qt.red, HIGHLIGHT_EDGE_WIDTH, Qt.SolidLine, Qt.RoundCap)
+PEN_CONFLICT = QPen(Qt.red, 4)
+PEN_TEMP = QPen(Theme.EDGE_TEMP, 2, Qt.DashLine)
 
 class EdgeItem(QGraphicsLineItem):
     """
@@ -13,30 +20,49 @@ class EdgeItem(QGraphicsLineItem):
     def __init__(self, edge: Edge, start_pos: QPointF, end_pos: QPointF, parent=None):
         super().__init__(parent)
         self.edge = edge
+        # Canonical (min, max) pair, computed once for index lookups
+        s, t = edge.source, edge.target
+        self.key = (s, t) if s <= t else (t, s)
         
         self.setLine(start_pos.x(), start_pos.y(), end_pos.x(), end_pos.y())
 
-        self.setPen(QPen(
-            Theme.EDGE_DEFAULT, 
-            EDGE_WIDTH, 
-            Qt.SolidLine, 
-            Qt.RoundCap
-        ))
+        self._style_pen = PEN_DEFAULT
+        self.setPen(PEN_DEFAULT)
         
         # Edges below nodes
         self.setZValue(1)
+
+        # Most edges are static between frames; blit the rasterized line
+        # instead of re-stroking it. setLine/setPen invalidate the cache.
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
+        # Edges are never selected or dragged on their own; keep the scene
+        # from doing per-move geometry-change bookkeeping for them
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, False)
+        self.setFlag(QGraphicsItem.ItemIsSelectable, False)
         
     def update_positions(self, start_pos: QPointF, end_pos: QPointF):
         """Update edge endpoints."""
         self.setLine(start_pos.x(), start_pos.y(), end_pos.x(), end_pos.y())
+
+    def set_endpoints(self, x1: float, y1: float, x2: float, y2: float):
+        """Update edge endpoints from plain coordinates (no QPointF)."""
+        self.setLine(x1, y1, x2, y2)
         
     def connects_node(self, node_id: int) -> bool:
         """Check if this edge connects to a given node."""
         return self.edge.connects(node_id)
     
+    def set_style_pen(self, pen: QPen):
+        """Apply one of the shared pens, skipping the update if already set."""
+        if pen is self._style_pen:
+            return
+        self._style_pen = pen
+        self.setPen(pen)
+
     def set_conflict(self, on: bool):
         if on:
-            self.setPen(QPen(Qt.red, 4))
+            self.set_style_pen(PEN_CONFLICT)
 
 class TempEdgeItem(QGraphicsLineItem):
     """
@@ -46,23 +72,29 @@ class TempEdgeItem(QGraphicsLineItem):
     def __init__(self, start_pos: QPointF, parent=None):
         super().__init__(parent)
         self.start_pos = start_pos
+        self._sx, self._sy = start_pos.x(), start_pos.y()
+        self._last_ex, self._last_ey = self._sx, self._sy
         
         # Set initial line (both ends at start)
-        self.setLine(start_pos.x(), start_pos.y(), start_pos.x(), start_pos.y())
+        self.setLine(self._sx, self._sy, self._sx, self._sy)
         
         # Dashed line style
-        self.setPen(QPen(
-            Theme.EDGE_TEMP, 
-            2, 
-            Qt.DashLine
-        ))
+        self.setPen(PEN_TEMP)
         
         self.setZValue(5)  # Above edges, below nodes
+
+        # Purely visual: no geometry notifications, selection or mouse input
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, False)
+        self.setFlag(QGraphicsItem.ItemIsSelectable, False)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setEnabled(False)
         
     def update_end(self, end_pos: QPointF):
         """Update the end position as mouse moves."""
-        self.setLine(
-            self.start_pos.x(), self.start_pos.y(),
-            end_pos.x(), end_pos.y()
-        )
+        ex, ey = end_pos.x(), end_pos.y()
+        # Skip sub-pixel motion; it would not change the drawn line
+        if abs(ex - self._last_ex) + abs(ey - self._last_ey) < 1.0:
+            return
+        self._last_ex, self._last_ey = ex, ey
+        self.setLine(self._sx, self._sy, ex, ey)
         
\ No newline at end of file
@@ -1,20 +1,27 @@
-from typing import List, Optional, Dict, Tuple
+import heapq
+from array import array
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Iterable, List, Optional, Dict, Set, Tuple
 
 from PyQt5.QtWidgets import QGraphicsScene
 from PyQt5.QtCore import Qt, QPointF, pyqtSignal
-from PyQt5.QtGui import QBrush, QPen
+from PyQt5.QtGui import QBrush, QPen, QTransform
 
 from models.graph import Node, Edge, GraphState, Tool
 from .node_item import NodeItem
-from .edge_item import EdgeItem, TempEdgeItem
+from .edge_item import EdgeItem, TempEdgeItem, PEN_DEFAULT, PEN_HIGHLIGHT, PEN_ERROR
 from ..actions import UndoRedoManager
-from models.settings import Theme, EDGE_WIDTH, HIGHLIGHT_EDGE_WIDTH
+from models.settings import (
+    Theme, NODE_RADIUS, NODE_BORDER_WIDTH,
+    NO_INDEX_NODE_THRESHOLD, BSP_INDEX_NODE_THRESHOLD
+)
 
 
 class GraphScene(QGraphicsScene):
     """
     Signals:
-        node_moved: Emitted when a node is moved (int: node_id)
+        node_moved: Emitted when a node is moved (int: node_id), only if connected
         graph_changed: Emitted when graph structure changes
     """
     # Signals
@@ -33,6 +40,27 @@ class GraphScene(QGraphicsScene):
         # Visual items
         self._node_items: Dict[int, NodeItem] = {}
         self._edge_items: List[EdgeItem] = []
+
+        # Derived edge views, rebuilt lazily after edges change (see _edges_changed)
+        self._edge_tuples: Optional[Tuple[Tuple[int, int], ...]] = None
+        self._edge_soa: Optional[Tuple[array, array]] = None
+
+        # Lookup indices, kept in sync with the lists above
+        self._node_by_id: Dict[int, Node] = {}
+        self._edges_by_pair: Dict[Tuple[int, int], Edge] = {}  # key is (min, max)
+        self._edges_by_node: Dict[int, List[EdgeItem]] = {}
+        self._edge_item_by_pair: Dict[Tuple[int, int], EdgeItem] = {}  # key is (min, max)
+
+        # Node positions as a flat [x0, y0, x1, y1, ...] array; row i is self._nodes[i]
+        self._node_xy = array('d')
+        self._node_row: Dict[int, int] = {}
+        self._row_to_id: List[int] = []
+
+        # Min-heap of unused ids below _next_node_id
+        self._free_ids: List[int] = []
+
+        # Edge items currently drawn with a highlight pen
+        self._highlighted: Set[EdgeItem] = set()
         
         # Current tool
         self._current_tool = Tool.ADD_NODE
@@ -41,11 +69,15 @@ class GraphScene(QGraphicsScene):
         self._edge_start_node: Optional[int] = None
         self._temp_edge: Optional[TempEdgeItem] = None
         
-        # Undo/redo
-        self._undo_manager = UndoRedoManager()
+        # Bulk update nesting depth and whether the graph changed inside it
+        self._bulk_depth = 0
+        self._bulk_changed = False
+
+        # Whether the scene should use its BSP index (off for very large graphs)
+        self._use_bsp_index = True
         
-        # Connect signals
-        self.node_moved.connect(self._on_node_moved)
+        # Undo/redo
+        self._undo_manager = UndoRedoManager(snapshot=self._get_current_state, parent=self)
         
     @property
     def nodes(self) -> List[Node]:
@@ -82,57 +114,122 @@ class GraphScene(QGraphicsScene):
       
     def _get_current_state(self) -> GraphState:
         """Get current graph state."""
-        return GraphState(
-            nodes=[Node(n.id, n.x, n.y, n.color) for n in self._nodes],
-            edges=[Edge(e.source, e.target) for e in self._edges],
-            next_node_id=self._next_node_id
-        )
-    
-    def _get_state_with_node_at(self, node_id: int, pos: QPointF) -> GraphState:
-        """Get state with a specific node at a specific position."""
-        nodes = []
-        for n in self._nodes:
-            if n.id == node_id:
-                # Use the specified position for this node
-                nodes.append(Node(n.id, pos.x(), pos.y(), n.color))
-            else:
-                nodes.append(Node(n.id, n.x, n.y, n.color))
-        
-        return GraphState(
-            nodes=nodes,
-            edges=[Edge(e.source, e.target) for e in self._edges],
-            next_node_id=self._next_node_id
-        )    
+        return GraphState.capture(self._nodes, self._edges, self._next_node_id)
     
+    @contextmanager
+    def _bulk_update(self, suspend_index: bool = True):
+        """
+        Group many item changes into one update.
+        Optionally switches the scene to NoIndex so the BSP index is rebuilt
+        once on exit instead of per item, and emits at most one graph_changed.
+        """
+        outer = self._bulk_depth == 0
+        if outer:
+            self._bulk_changed = False
+            if suspend_index:
+                self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            self._bulk_depth -= 1
+            if outer:
+                self._update_index_method()
+                if self._bulk_changed:
+                    self.graph_changed.emit()
+
+    def _update_index_method(self):
+        """
+        Pick the item index for the current node count.
+        A BSP index speeds up hit-tests but costs O(log N) per insert/remove;
+        for very large graphs plain NoIndex is cheaper overall.
+        """
+        count = len(self._node_items)
+        if self._use_bsp_index and count > NO_INDEX_NODE_THRESHOLD:
+            self._use_bsp_index = False
+        elif not self._use_bsp_index and count < BSP_INDEX_NODE_THRESHOLD:
+            self._use_bsp_index = True
+        if self._bulk_depth == 0:
+            method = QGraphicsScene.BspTreeIndex if self._use_bsp_index else QGraphicsScene.NoIndex
+            if self.itemIndexMethod() != method:
+                self.setItemIndexMethod(method)
+
+    def _emit_graph_changed(self):
+        """Emit graph_changed now, or once at the end of the current bulk update."""
+        if self._bulk_depth:
+            self._bulk_changed = True
+        else:
+            self.graph_changed.emit()
+
     def _restore_state(self, state: GraphState):
         """Restore graph to a saved state."""
-        self._clear_scene_items()
-        
-        # Restore data
-        self._nodes = [Node(n.id, n.x, n.y, n.color) for n in state.nodes]
-        self._edges = [Edge(e.source, e.target) for e in state.edges]
-        self._next_node_id = state.next_node_id
-        
-        # Recreate visual items
-        for node in self._nodes:
-            self._create_node_item(node)
+        with self._bulk_update():
+            self._clear_scene_items()
             
-        for edge in self._edges:
-            self._create_edge_item(edge)
+            # Restore data
+            # Nodes and edges are frozen, so the snapshot's objects are shared
+            self._nodes = list(state.nodes)
+            self._edges = list(state.edges)
+            self._next_node_id = state.next_node_id
+            self._rebuild_indices()
             
-        self.graph_changed.emit()
+            # Recreate visual items without emitting per-item scene signals
+            self.blockSignals(True)
+            try:
+                for node in self._nodes:
+                    self._create_node_item(node)
+                    
+                for edge in self._edges:
+                    self._create_edge_item(edge)
+            finally:
+                self.blockSignals(False)
+                
+            self._emit_graph_changed()
         
-    def _save_state(self):
-        """Save current state for undo."""
-        self._undo_manager.save_state(self._get_current_state())
+    @staticmethod
+    def _edge_key(u: int, v: int) -> Tuple[int, int]:
+        """Canonical (undirected) key for an edge."""
+        return (u, v) if u <= v else (v, u)
+
+    def _rebuild_indices(self):
+        """Rebuild node/edge lookup dicts from the data lists."""
+        self._node_by_id = {n.id: n for n in self._nodes}
+        self._edges_by_pair = {self._edge_key(e.source, e.target): e for e in self._edges}
+        self._edges_changed()
+        self._rebuild_rows()
+        # Gaps below _next_node_id; an ascending list is already a valid heap
+        self._free_ids = [i for i in range(self._next_node_id) if i not in self._node_by_id]
+
+    def _rebuild_rows(self):
+        """Rebuild the position array and row maps to follow self._nodes order."""
+        self._row_to_id = [n.id for n in self._nodes]
+        self._node_row = {node_id: row for row, node_id in enumerate(self._row_to_id)}
+        self._node_xy = array('d', (c for n in self._nodes for c in (n.x, n.y)))
+
+    def _replace_node(self, node_id: int, **changes) -> Node:
+        """Swap in an updated copy of a (frozen) node everywhere it is referenced."""
+        row = self._node_row[node_id]
+        node = replace(self._nodes[row], **changes)
+        self._nodes[row] = node
+        self._node_by_id[node_id] = node
+        item = self._node_items.get(node_id)
+        if item is not None:
+            item.set_node(node)
+        return node
+
+    def _record_edit(self, kind: str, forward: tuple, inverse: tuple) -> bool:
+        """Record an already applied edit for undo. No-op edits are skipped."""
+        return self._undo_manager.save_delta(kind, forward, inverse)
 
     def save_move_state(self, node_id: int, old_pos: QPointF, new_pos: QPointF):
         """
         Save state for undo after a node move.
         """
-        # Save state with node at OLD position (before the move)
-        old_state = self._get_state_with_node_at(node_id, old_pos)
-        self._undo_manager.save_state(old_state)
+        self._record_edit(
+            "move_node",
+            ("move_node", node_id, new_pos.x(), new_pos.y()),
+            ("move_node", node_id, old_pos.x(), old_pos.y())
+        )
 
     #-----------------------Undo/Redo---------------------------    
         
@@ -158,22 +255,30 @@ class GraphScene(QGraphicsScene):
         
     def add_node(self, x: float, y: float) -> Node:
         """Add a new node at the specified position."""
-        self._save_state()
-        
-        # Find the smallest available ID 
-        used_ids = {n.id for n in self._nodes}
-        new_id = 0
-        while new_id in used_ids:
-            new_id += 1
+        # Reuse the smallest freed ID, otherwise take the next one
+        new_id = heapq.heappop(self._free_ids) if self._free_ids else self._next_node_id
         
         node = Node(id=new_id, x=x, y=y)
         self._nodes.append(node)
+        self._node_by_id[new_id] = node
+        self._node_row[new_id] = len(self._row_to_id)
+        self._row_to_id.append(new_id)
+        self._node_xy.append(x)
+        self._node_xy.append(y)
         
         # Update next_node_id to be at least new_id + 1
+        old_next_id = self._next_node_id
         self._next_node_id = max(self._next_node_id, new_id + 1)
         
+        self._record_edit(
+            "add_node",
+            ("batch", (("add_node", node, None), ("next_node_id", self._next_node_id))),
+            ("batch", (("remove_node", new_id), ("next_node_id", old_next_id)))
+        )
+        
         self._create_node_item(node)
-        self.graph_changed.emit()
+        self._update_index_method()
+        self._emit_graph_changed()
         return node
         
     def _create_node_item(self, node: Node):
@@ -184,17 +289,34 @@ class GraphScene(QGraphicsScene):
         
     def get_node_at(self, pos: QPointF) -> Optional[int]:
         """Get node id at position, or None."""
-        for node_id, item in self._node_items.items():
-            if item.contains(item.mapFromScene(pos)):
-                return node_id
+        if not self._use_bsp_index:
+            # No spatial index: a float distance test beats per-item shape tests
+            return self._node_at_xy(pos.x(), pos.y())
+
+        # Use the scene's spatial index; labels resolve to their parent node
+        item = self.itemAt(pos, QTransform())
+        while item is not None:
+            if isinstance(item, NodeItem):
+                return item.node.id
+            item = item.parentItem()
+        return None
+
+    def _node_at_xy(self, x: float, y: float) -> Optional[int]:
+        """Find the topmost node whose circle (including its border) contains (x, y)."""
+        r = NODE_RADIUS + NODE_BORDER_WIDTH / 2
+        r2 = r * r
+        xy = self._node_xy
+        # Later rows are drawn on top, so scan from the end
+        for row in range(len(self._row_to_id) - 1, -1, -1):
+            dx = xy[2 * row] - x
+            dy = xy[2 * row + 1] - y
+            if dx * dx + dy * dy <= r2:
+                return self._row_to_id[row]
         return None
         
     def get_node_by_id(self, node_id: int) -> Optional[Node]:
         """Get node by ID."""
-        for node in self._nodes:
-            if node.id == node_id:
-                return node
-        return None
+        return self._node_by_id.get(node_id)
     
     #-----------------------Edge---------------------------   
         
@@ -205,18 +327,23 @@ class GraphScene(QGraphicsScene):
             return None
             
         # Check if edge already exists
-        for edge in self._edges:
-            if (edge.source == source_id and edge.target == target_id) or \
-               (edge.source == target_id and edge.target == source_id):
-                return None
-                
-        self._save_state()
+        key = self._edge_key(source_id, target_id)
+        if key in self._edges_by_pair:
+            return None
         
         edge = Edge(source=source_id, target=target_id)
         self._edges.append(edge)
+        self._edges_by_pair[key] = edge
+        self._edges_changed()
+        
+        self._record_edit(
+            "add_edge",
+            ("add_edge", source_id, target_id, None),
+            ("remove_edge", source_id, target_id)
+        )
         
         self._create_edge_item(edge)
-        self.graph_changed.emit()
+        self._emit_graph_changed()
         return edge
         
     def _create_edge_item(self, edge: Edge):
@@ -227,14 +354,60 @@ class GraphScene(QGraphicsScene):
             item = EdgeItem(edge, start, end)
             self.addItem(item)
             self._edge_items.append(item)
+            self._edges_by_node.setdefault(edge.source, []).append(item)
+            self._edges_by_node.setdefault(edge.target, []).append(item)
+            self._edge_item_by_pair[item.key] = item
             
     def _on_node_moved(self, node_id: int):
-        """Update edges when a node is moved."""
-        for item in self._edge_items:
-            if item.connects_node(node_id):
-                start = self._node_items[item.edge.source].pos()
-                end = self._node_items[item.edge.target].pos()
-                item.update_positions(start, end)
+        """
+        Update node data and edges after a node item has moved.
+        Called directly by NodeItem.itemChange on every drag step.
+        """
+        node_item = self._node_items.get(node_id)
+        if node_item is None or self._bulk_depth:
+            # Bulk updates sync node data and edges themselves
+            return
+        x, y = node_item._px, node_item._py
+        row = self._node_row[node_id]
+        self._node_xy[2 * row] = x
+        self._node_xy[2 * row + 1] = y
+        self._replace_node(node_id, x=x, y=y)
+        for item in self._edges_by_node.get(node_id, ()):
+            self._update_edge_line(item)
+        # External observers only; skip the dispatch when nobody listens
+        if self.receivers(self.node_moved):
+            self.node_moved.emit(node_id)
+
+    def _update_edge_line(self, item: EdgeItem):
+        """Set an edge item's line from the stored node positions."""
+        xy = self._node_xy
+        s = 2 * self._node_row[item.edge.source]
+        t = 2 * self._node_row[item.edge.target]
+        item.set_endpoints(xy[s], xy[s + 1], xy[t], xy[t + 1])
+
+    def bulk_update_positions(self, positions: Dict[int, Tuple[float, float]]):
+        """
+        Move many nodes at once (e.g. from a layout algorithm).
+        Positions are written into the position array first and every edge
+        is then updated once, instead of once per moved endpoint.
+        Not recorded for undo.
+        """
+        xy = self._node_xy
+        with self._bulk_update():
+            self.blockSignals(True)
+            try:
+                for node_id, (x, y) in positions.items():
+                    row = self._node_row.get(node_id)
+                    if row is None:
+                        continue
+                    xy[2 * row] = x
+                    xy[2 * row + 1] = y
+                    self._replace_node(node_id, x=x, y=y)
+                    self._node_items[node_id].setPos(x, y)
+            finally:
+                self.blockSignals(False)
+            for item in self._edge_items:
+                self._update_edge_line(item)
                 
     def _start_edge_creation(self, node_id: int, pos: QPointF):
         """Start creating a new edge from a node."""
@@ -262,26 +435,41 @@ class GraphScene(QGraphicsScene):
             self._temp_edge = None
     
     # Delete Node 
-    def _remove_node_visuals(self, node_id: int):
-        """Remove node and connected edges from scene and collections."""
-        edges_to_remove = [e for e in self._edges if e.source == node_id or e.target == node_id]
-        edge_items_to_remove = [item for item in self._edge_items 
-                                if item.edge.source == node_id or item.edge.target == node_id]
-        
-        for item in edge_items_to_remove:
-            self._edge_items.remove(item)
+    def _remove_nodes(self, node_ids: List[int]):
+        """Remove nodes and their connected edges from scene and collections in one pass."""
+        ids = {node_id for node_id in node_ids if node_id in self._node_by_id}
+        if not ids:
+            return
+
+        # Incident edge items, each once even if both endpoints go
+        dropped: Set[EdgeItem] = set()
+        for node_id in ids:
+            dropped.update(self._edges_by_node.pop(node_id, ()))
+
+        for item in dropped:
+            source, target = item.edge.source, item.edge.target
+            for end in (source, target):
+                if end not in ids:
+                    self._edges_by_node[end].remove(item)
+            self._highlighted.discard(item)
             self.removeItem(item)
-        
-        for edge in edges_to_remove:
-            self._edges.remove(edge)
-        
-        node_to_remove = next((n for n in self._nodes if n.id == node_id), None)
-        if node_to_remove:
-            self._nodes.remove(node_to_remove)
-        
-        node_item = self._node_items.pop(node_id, None)
-        if node_item:
-            self.removeItem(node_item)
+            key = item.key
+            self._edge_item_by_pair.pop(key, None)
+            self._edges_by_pair.pop(key, None)
+
+        if dropped:
+            self._edge_items = [it for it in self._edge_items if it not in dropped]
+            self._edges = [e for e in self._edges if e.source not in ids and e.target not in ids]
+            self._edges_changed()
+
+        self._nodes = [n for n in self._nodes if n.id not in ids]
+        self._rebuild_rows()
+        for node_id in ids:
+            del self._node_by_id[node_id]
+            heapq.heappush(self._free_ids, node_id)
+            node_item = self._node_items.pop(node_id, None)
+            if node_item:
+                self.removeItem(node_item)
 
     def delete_node(self, node_id: int):
         """Delete a node and all its connected edges."""
@@ -289,9 +477,11 @@ class GraphScene(QGraphicsScene):
         if node_id not in self._node_items:
             return
             
-        self._save_state()
-        self._remove_node_visuals(node_id)
-        self.graph_changed.emit()
+        forward, inverse = self._delete_edit_ops([node_id])
+        self._remove_nodes([node_id])
+        self._record_edit("delete_nodes", forward, inverse)
+        self._update_index_method()
+        self._emit_graph_changed()
         
     def delete_selected_nodes(self):
         """Delete all selected nodes."""
@@ -305,18 +495,32 @@ class GraphScene(QGraphicsScene):
         if not node_ids_to_delete:
             return
         
-        # Save state once for all deletions
-        self._save_state()
-        
-        # Delete each node (without saving state again)
-        for node_id in node_ids_to_delete:
-            self._delete_node_no_save(node_id)
+        forward, inverse = self._delete_edit_ops(node_ids_to_delete)
         
-        self.graph_changed.emit()
+        # Delete all nodes in a single pass, then record one edit for all of them.
+        # Few items change here, so keep the index updating incrementally.
+        with self._bulk_update(suspend_index=False):
+            self._remove_nodes(node_ids_to_delete)
+            self._record_edit("delete_nodes", forward, inverse)
+            self._emit_graph_changed()
     
-    def _delete_node_no_save(self, node_id: int):
-        """Delete a node without saving state (for batch operations)."""
-        self._remove_node_visuals(node_id)    
+    def _delete_edit_ops(self, node_ids: List[int]) -> Tuple[tuple, tuple]:
+        """
+        Forward and inverse undo ops for deleting nodes and their edges.
+        Built from the current lists, so call before the nodes are removed and
+        record the edit after, like every other edit.
+        """
+        ids = set(node_ids)
+        removed_nodes = [(i, n) for i, n in enumerate(self._nodes) if n.id in ids]
+        removed_edges = [(i, e) for i, e in enumerate(self._edges)
+                         if e.source in ids or e.target in ids]
+
+        forward = tuple(("remove_edge", e.source, e.target) for _, e in removed_edges) + \
+                  tuple(("remove_node", n.id) for _, n in removed_nodes)
+        # Re-insert in ascending index order so the original ordering is restored
+        inverse = tuple(("add_node", n, i) for i, n in removed_nodes) + \
+                  tuple(("add_edge", e.source, e.target, i) for i, e in removed_edges)
+        return ("batch", forward), ("batch", inverse)
 
     #-----------------------Clear---------------------------   
     
@@ -325,75 +529,110 @@ class GraphScene(QGraphicsScene):
         if not self._nodes and not self._edges:
             return
             
-        self._save_state()
-        
-        self._nodes.clear()
-        self._edges.clear()
-        self._next_node_id = 0
+        self._undo_manager.save_snapshot("clear", self._get_current_state(), GraphState())
         
-        self._clear_scene_items()
+        with self._bulk_update():
+            self._nodes.clear()
+            self._edges.clear()
+            self._next_node_id = 0
+            self._rebuild_indices()
             
-        self.graph_changed.emit()
+            self._clear_scene_items()
+                
+            self._emit_graph_changed()
 
     def _clear_scene_items(self):
         """Remove all visual items from scene."""
-        node_items_to_remove = list(self._node_items.values())
-        edge_items_to_remove = list(self._edge_items)
-        
+        # The temporary edge is a scene item too; drop it before clear() deletes it
+        self._cancel_edge_creation()
+
         self._node_items.clear()
         self._edge_items.clear()
-        
-        for item in edge_items_to_remove:
-            self.removeItem(item)
-        for item in node_items_to_remove:
-            self.removeItem(item)
+        self._edges_by_node.clear()
+        self._edge_item_by_pair.clear()
+        self._highlighted.clear()
+
+        # One C++ call instead of a removeItem per item
+        self.clear()
         
     # Reset colors             
     def reset_colors(self):
         """Reset all nodes to uncolored state."""
         for node in self._nodes:
-            node.color = -1
-            if node.id in self._node_items:
-                self._node_items[node.id].reset_color()
+            if node.color != -1:
+                self._replace_node(node.id, color=-1)
+
+    def set_node_color(self, node_id: int, color: int):
+        """Set a node's color and update its appearance."""
+        node = self._node_by_id.get(node_id)
+        if node is not None and node.color != color:
+            self._replace_node(node_id, color=color)
 
     def reset_edge_styles(self):
         """Reset all edges to default style."""
-        for item in self._edge_items:
-            item.setPen(QPen(Theme.EDGE_DEFAULT, EDGE_WIDTH, Qt.SolidLine, Qt.RoundCap))
+        self._clear_highlights()
+
+    def _clear_highlights(self):
+        """Reset only the currently highlighted edges to the default pen."""
+        for item in self._highlighted:
+            item.set_style_pen(PEN_DEFAULT)
+        self._highlighted.clear()
+
+    def _set_highlights(self, items: Iterable[EdgeItem], pen: QPen):
+        """Highlight exactly the given items, touching only edges whose style changes."""
+        new = set(items)
+        for item in self._highlighted - new:
+            item.set_style_pen(PEN_DEFAULT)
+        for item in new:
+            item.set_style_pen(pen)
+        self._highlighted = new
 
     def _find_edge_item(self, u: int, v: int) -> Optional[EdgeItem]:
         """Find edge item connecting u and v (bidirectional)."""
-        for item in self._edge_items:
-            a, b = item.edge.source, item.edge.target
-            if (a == u and b == v) or (a == v and b == u):
-                return item
-        return None
+        return self._edge_item_by_pair.get(self._edge_key(u, v))
 
     def _find_edge_items(self, edges) -> List[EdgeItem]:
         """Find edge items for given edge list."""
-        edges_set = {tuple(sorted(e)) for e in edges}
-        return [
-            item for item in self._edge_items
-            if tuple(sorted((item.edge.source, item.edge.target))) in edges_set
-        ]
+        items = []
+        for u, v in edges:
+            item = self._edge_item_by_pair.get(self._edge_key(u, v))
+            if item is not None:
+                items.append(item)
+        return items
 
     def highlight_edge(self, u: int, v: int):
         """Highlight a specific edge (u,v) in red."""
-        self.reset_edge_styles()
         item = self._find_edge_item(u, v)
-        if item:
-            item.setPen(QPen(Theme.ACCENT_ERROR, HIGHLIGHT_EDGE_WIDTH, Qt.SolidLine, Qt.RoundCap))
+        self._set_highlights((item,) if item else (), PEN_HIGHLIGHT)
             
     def highlight_edges(self, edges):
         """Highlight multiple edges."""
-        self.reset_edge_styles()
-        for item in self._find_edge_items(edges):
-            item.setPen(QPen(Qt.red, HIGHLIGHT_EDGE_WIDTH, Qt.SolidLine, Qt.RoundCap))
+        self._set_highlights(self._find_edge_items(edges), PEN_ERROR)
                 
     # Export Data
-    def get_edges_as_tuples(self) -> List[Tuple[int, int]]:
-        """Get edges as list of (source, target) tuples."""
-        return [e.as_tuple() for e in self._edges]
+    def _edges_changed(self):
+        """Drop the derived edge views after self._edges changed."""
+        self._edge_tuples = None
+        self._edge_soa = None
+
+    def get_edges_as_tuples(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Get edges as a tuple of (source, target) tuples.
+        The tuple is cached until the edges change and is replaced, never mutated.
+        """
+        if self._edge_tuples is None:
+            self._edge_tuples = tuple(e.as_tuple() for e in self._edges)
+        return self._edge_tuples
+
+    def get_edges_soa(self) -> Tuple[array, array]:
+        """
+        Get edges as two parallel int arrays (sources, targets), in edge order.
+        Cached like get_edges_as_tuples; callers must not modify the arrays.
+        """
+        if self._edge_soa is None:
+            edges = self.get_edges_as_tuples()
+            self._edge_soa = (array('l', [u for u, _ in edges]), array('l', [v for _, v in edges]))
+        return self._edge_soa
         
     # Mouse Events
     def mousePressEvent(self, event):
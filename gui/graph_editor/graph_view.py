@@ -16,8 +16,11 @@ class GraphView(QGraphicsView):
         self.setRenderHint(QPainter.SmoothPixmapTransform)
         self.setRenderHint(QPainter.TextAntialiasing)
         
-        # Update mode
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Update mode: repaint only the dirty regions of changed items
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        # Painter state is not saved between items: custom paint() overrides must
+        # leave pen, brush and other painter state as they found it
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
         
         # Scroll bars
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
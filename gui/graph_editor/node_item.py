@@ -1,10 +1,57 @@
-from PyQt5.QtWidgets import QGraphicsEllipseItem, QGraphicsTextItem
-from PyQt5.QtCore import Qt, QPointF
-from PyQt5.QtGui import QPen, QBrush, QColor, QRadialGradient
+from typing import Dict, Tuple
+
+from PyQt5.QtWidgets import QGraphicsEllipseItem, QGraphicsTextItem, QStyle
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QPen, QBrush, QRadialGradient, QPixmap, QPixmapCache, QPainter
 
 from models.graph import Node
 from models.settings import *
 
+# (brush, pen) per palette index, -1 for uncolored; shared by all node items
+_APPEARANCE_CACHE: Dict[int, Tuple[QBrush, QPen]] = {}
+
+def _node_appearance(color: int) -> Tuple[QBrush, QPen]:
+    """Gradient brush and border pen for a node color, built once per color."""
+    key = color if 0 <= color < len(COLORING_PALETTE) else -1
+    cached = _APPEARANCE_CACHE.get(key)
+    if cached is None:
+        fill_color = COLORING_PALETTE[key] if key >= 0 else UNCOLORED_NODE
+
+        # Create gradient fill for 3D effect
+        gradient = QRadialGradient(-NODE_RADIUS/3, -NODE_RADIUS/3, NODE_RADIUS * 1.5)
+        gradient.setColorAt(0, fill_color.lighter(140))
+        gradient.setColorAt(0.5, fill_color)
+        gradient.setColorAt(1, fill_color.darker(120))
+
+        cached = (QBrush(gradient), QPen(fill_color.darker(150), NODE_BORDER_WIDTH))
+        _APPEARANCE_CACHE[key] = cached
+    return cached
+
+# Node sprites cover the disc plus its border; drawn at 2x so hover scaling stays sharp
+_SPRITE_HALF = NODE_RADIUS + NODE_BORDER_WIDTH
+_SPRITE_RECT = QRectF(-_SPRITE_HALF, -_SPRITE_HALF, 2 * _SPRITE_HALF, 2 * _SPRITE_HALF)
+_SPRITE_SCALE = 2
+
+def _node_pixmap(color: int) -> QPixmap:
+    """Prerendered node disc for a color, kept in QPixmapCache."""
+    key = f"node/{color if 0 <= color < len(COLORING_PALETTE) else -1}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        size = 2 * _SPRITE_HALF * _SPRITE_SCALE
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(_SPRITE_SCALE, _SPRITE_SCALE)
+        painter.translate(_SPRITE_HALF, _SPRITE_HALF)
+        brush, pen = _node_appearance(color)
+        painter.setBrush(brush)
+        painter.setPen(pen)
+        painter.drawEllipse(QRectF(-NODE_RADIUS, -NODE_RADIUS, NODE_RADIUS * 2, NODE_RADIUS * 2))
+        painter.end()
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
 
 class NodeItem(QGraphicsEllipseItem):
     """
@@ -25,6 +72,8 @@ class NodeItem(QGraphicsEllipseItem):
             NODE_RADIUS * 2, NODE_RADIUS * 2
         )
         self.setPos(node.x, node.y)
+        # Position as plain floats, refreshed on every move
+        self._px, self._py = node.x, node.y
         
         # Enable interactions
         self.setFlag(QGraphicsEllipseItem.ItemIsMovable, True)
@@ -54,41 +103,33 @@ class NodeItem(QGraphicsEllipseItem):
         
     def update_appearance(self):
         """Update visual appearance based on color state."""
-        fill_color = self._get_fill_color()
-        
-        # Create gradient fill for 3D effect
-        gradient = QRadialGradient(-NODE_RADIUS/3, -NODE_RADIUS/3, NODE_RADIUS * 1.5)
-        gradient.setColorAt(0, fill_color.lighter(140))
-        gradient.setColorAt(0.5, fill_color)
-        gradient.setColorAt(1, fill_color.darker(120))
-        
-        self.setBrush(QBrush(gradient))
-        self.setPen(QPen(fill_color.darker(150), NODE_BORDER_WIDTH))
-        
-    def _get_fill_color(self) -> QColor:
-        """Get the fill color based on node's coloring."""
-        if 0 <= self.node.color < len(COLORING_PALETTE):
-            return COLORING_PALETTE[self.node.color]
-        return UNCOLORED_NODE
-    
-    def set_color(self, color: int):
-        """Set the node's color and update appearance."""
-        self.node.color = color
-        self.update_appearance()
-        
-    def reset_color(self):
-        """Reset to uncolored state."""
-        self.set_color(-1)
+        brush, pen = _node_appearance(self.node.color)
+        self.setBrush(brush)
+        self.setPen(pen)
+        
+    def paint(self, painter, option, widget=None):
+        """Blit the cached node sprite; selected nodes use the default painting."""
+        if option.state & QStyle.State_Selected:
+            super().paint(painter, option, widget)
+            return
+        pixmap = _node_pixmap(self.node.color)
+        painter.drawPixmap(_SPRITE_RECT, pixmap, QRectF(pixmap.rect()))
+
+    def set_node(self, node: Node):
+        """Show updated (immutable) node data; repaints only if the color changed."""
+        color_changed = node.color != self.node.color
+        self.node = node
+        if color_changed:
+            self.update_appearance()
         
     def itemChange(self, change, value):
         """Handle item changes, particularly position updates."""
-        if change == QGraphicsEllipseItem.ItemPositionChange:
-            # Update node data when moved
-            self.node.x = value.x()
-            self.node.y = value.y()
-            # Notify scene to update edges
-            if self.scene():
-                self.scene().node_moved.emit(self.node.id)
+        if change == QGraphicsEllipseItem.ItemPositionHasChanged:
+            self._px, self._py = value.x(), value.y()
+            # Let the scene update node data and edges (direct call, no signal)
+            scene = self.scene()
+            if scene is not None:
+                scene._on_node_moved(self.node.id)
         return super().itemChange(change, value)
     
     def mousePressEvent(self, event):
@@ -125,13 +166,18 @@ class NodeItem(QGraphicsEllipseItem):
     
     def hoverEnterEvent(self, event):
         """Scale up on hover."""
-        self.setScale(1.1)
+        self._set_hover_scale(1.1)
         super().hoverEnterEvent(event)
         
     def hoverLeaveEvent(self, event):
         """Scale back to normal."""
-        self.setScale(1.0)
+        self._set_hover_scale(1.0)
         super().hoverLeaveEvent(event)
+
+    def _set_hover_scale(self, scale: float):
+        # Scale changes never report ItemPositionHasChanged, so edges are not touched
+        if self.scale() != scale:
+            self.setScale(scale)
         
     def sync_position(self):
         """Sync Qt position with node data."""
@@ -1,18 +1,17 @@
-from typing import List, Optional, Dict, Tuple
+import os
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from operator import eq
+from typing import List, Optional, Dict, Tuple, FrozenSet, TYPE_CHECKING
 
-from klee.code_generator import CodeGenerator
-from klee.runner import KleeRunner
-from klee.ktest_parser import KTestParser
-
-from typing import List, Optional
 from pathlib import Path
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QSpinBox, QFrame, QMessageBox,
-    QApplication
+    QLabel, QPushButton, QSpinBox, QFrame, QMessageBox
 )
-from PyQt5.QtCore import Qt, QSize, QThreadPool
+from PyQt5.QtCore import Qt, QSize, QThreadPool, QTimer
 from PyQt5.QtGui import QIcon
 
 from models.graph import Tool
@@ -21,7 +20,23 @@ from .graph_editor.graph_scene import GraphScene
 from .graph_editor.graph_view import GraphView
 from .search_tree.tree_view import SearchTreeWidget
 from models.settings import Styles, Fonts, Dimensions
-from models.klee_worker import KleeWorker, KleeWorkerSignals, KleeRunner, logger
+from models.klee_worker import KleeWorker, logger
+
+if TYPE_CHECKING:
+    # The klee package is imported on first use, not at GUI startup
+    from klee.code_generator import CodeGenerator
+
+# Icon file extensions, in order of preference
+_ICON_EXTENSIONS = ('.png', '.svg', '.ico')
+
+# Icon size for toolbar buttons, shared by all of them
+_ICON_SIZE = QSize(24, 24)
+
+# Finished KLEE runs kept for replay, keyed by graph fingerprint
+KLEE_CACHE_SIZE = 16
+
+# Found colorings are applied to the UI at most once per interval
+FOUND_FLUSH_INTERVAL_MS = 50
 
 class MainWindow(QMainWindow):
 
@@ -37,9 +52,15 @@ class MainWindow(QMainWindow):
         
         # Icons directory (relative to this file)
         self._icons_dir = Path(__file__).parent.parent / "icons"
+        self._icon_paths = self._scan_icons()
+        self._icon_cache: Dict[str, QIcon] = {}
 
         # Generated C code - supplied to KLEE
         self._generated_code: Optional[str] = None
+        # (fingerprint, code) of the last CodeGenerator run, see _generate_code
+        self._code_cache: Optional[Tuple[tuple, str]] = None
+        # Reused across calls; only sections whose inputs changed are rebuilt
+        self._code_generator: Optional["CodeGenerator"] = None
 
         # Store results
         self._colorings: List[List[int]] = []
@@ -47,29 +68,89 @@ class MainWindow(QMainWindow):
 
         self._code_dialog = None
 
-        self._thread_pool = QThreadPool.globalInstance()
+        # Dedicated pool for KLEE runs; each run is a CPU-heavy subprocess,
+        # so cap concurrent runs instead of sharing the global pool
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max(1, (os.cpu_count() or 2) // 2))
 
         # Node ID mapping for KLEE (old_id -> new_consecutive_id)
         self._node_id_mapping: Dict[int, int] = {}
         self._reverse_mapping: Dict[int, int] = {}  # new_id -> old_id
+        # (scene edge arrays, mapping, edges in coloring index space), see _mapped_edges
+        self._mapped_edges_cache = None
         
         self._active_worker = None
+
+        # Fingerprint of the graph the current KLEE run was started for
+        self._klee_fingerprint: Optional[tuple] = None
+        self._klee_cache: "OrderedDict[tuple, List[List[int]]]" = OrderedDict()
+
+        # Colorings received from the worker but not yet applied to the UI
+        self._pending_found: List[List[int]] = []
+        self._found_flush_timer = QTimer(self)
+        self._found_flush_timer.setSingleShot(True)
+        self._found_flush_timer.setInterval(FOUND_FLUSH_INTERVAL_MS)
+        self._found_flush_timer.timeout.connect(self._flush_found_colorings)
+
+        # Coalesces graph_changed emissions from one event-loop turn
+        self._graph_change_timer = QTimer(self)
+        self._graph_change_timer.setSingleShot(True)
+        self._graph_change_timer.setInterval(0)
+        self._graph_change_timer.timeout.connect(self._on_graph_changed)
         
+        # The search tree widget is created after the window is first shown
+        self.tree_view: Optional[SearchTreeWidget] = None
+        self._ready = False
+
         # Setup UI
         self._setup_ui()
         self._connect_signals()
+        QTimer.singleShot(0, self._deferred_setup)
+
+    def _deferred_setup(self):
+        """
+        Finish the parts of the UI that are not needed for the first paint.
+        """
+        self.tree_view = SearchTreeWidget(main_window=self)
+        self.tree_view.setMinimumSize(
+            Dimensions.MIN_CANVAS_WIDTH,
+            Dimensions.MIN_CANVAS_HEIGHT
+        )
+        self._tree_panel_layout.addWidget(self.tree_view)
+        self.tree_view.leaf_clicked.connect(self._on_leaf_clicked)
+        self.tree_view.layout_failed.connect(self._on_tree_layout_failed)
+        self._ready = True
+
+    def _scan_icons(self) -> Dict[str, str]:
+        """
+        Map icon names to file paths with a single directory scan.
+        """
+        found: Dict[str, Dict[str, str]] = {}
+        try:
+            with os.scandir(self._icons_dir) as entries:
+                for entry in entries:
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext in _ICON_EXTENSIONS:
+                        found.setdefault(stem, {})[ext] = entry.path
+        except OSError:
+            return {}
+        return {
+            stem: next(paths[ext] for ext in _ICON_EXTENSIONS if ext in paths)
+            for stem, paths in found.items()
+        }
 
     def _get_icon(self, name: str) -> QIcon:
         """
         Load an icon from the icons directory.
+        Icons are created once and shared between buttons.
         """
-        for ext in ['.png', '.svg', '.ico']:
-            icon_path = self._icons_dir / f"{name}{ext}"
-            if icon_path.exists():
-                return QIcon(str(icon_path))
-        
-        # Fallback: return empty icon (button will show text instead)
-        return QIcon()
+        icon = self._icon_cache.get(name)
+        if icon is None:
+            path = self._icon_paths.get(name)
+            # Fallback: empty icon (button will show text instead)
+            icon = QIcon(path) if path is not None else QIcon()
+            self._icon_cache[name] = icon
+        return icon
 
     def _setup_ui(self):
         
@@ -104,7 +185,7 @@ class MainWindow(QMainWindow):
     def _create_graph_editor_panel(self) -> QFrame:
         """Create the graph editor panel."""
         panel = QFrame()
-        panel.setStyleSheet(Styles.panel())
+        panel.setObjectName("panelFrame")
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(
             Dimensions.PANEL_MARGIN,
@@ -117,7 +198,7 @@ class MainWindow(QMainWindow):
         title = QLabel("GRAPH EDITOR")
         title.setFont(Fonts.title())
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet(Styles.label_title())
+        title.setObjectName("titleLabel")
         layout.addWidget(title)
         
         # Graph scene and view
@@ -197,14 +278,14 @@ class MainWindow(QMainWindow):
             Dimensions.TOOL_BUTTON_SIZE
         )
         btn.setToolTip(tooltip)
-        btn.setStyleSheet(Styles.tool_button())
+        btn.setObjectName("toolButton")
         btn.setCursor(Qt.PointingHandCursor)
         
         # Try to load icon
         icon = self._get_icon(icon_name)
         if not icon.isNull():
             btn.setIcon(icon)
-            btn.setIconSize(QSize(24, 24))  # Adjust icon size as needed
+            btn.setIconSize(_ICON_SIZE)
         else:
             # Fallback to text
             btn.setText(fallback_text)
@@ -219,14 +300,14 @@ class MainWindow(QMainWindow):
             Dimensions.TOOL_BUTTON_SIZE
         )
         btn.setToolTip(tooltip)
-        btn.setStyleSheet(Styles.tool_button())
+        btn.setObjectName("toolButton")
         btn.setCursor(Qt.PointingHandCursor)
         return btn
         
     def _create_search_tree_panel(self) -> QFrame:
         """Create the search tree panel."""
         panel = QFrame()
-        panel.setStyleSheet(Styles.panel())
+        panel.setObjectName("panelFrame")
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(
             Dimensions.PANEL_MARGIN,
@@ -239,15 +320,11 @@ class MainWindow(QMainWindow):
         title = QLabel("SEARCH TREE")
         title.setFont(Fonts.title())
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet(Styles.label_title())
+        title.setObjectName("titleLabel")
         layout.addWidget(title)
         
-        self.tree_view = SearchTreeWidget(main_window=self)
-        self.tree_view.setMinimumSize(
-            Dimensions.MIN_CANVAS_WIDTH,
-            Dimensions.MIN_CANVAS_HEIGHT
-        )
-        layout.addWidget(self.tree_view)
+        # The tree widget itself is added by _deferred_setup
+        self._tree_panel_layout = layout
         
         return panel
         
@@ -260,14 +337,14 @@ class MainWindow(QMainWindow):
         colors_layout = QHBoxLayout()
         colors_label = QLabel("Number of colors:")
         colors_label.setFont(Fonts.title()) 
-        colors_label.setStyleSheet("color: #333333; font-size: 16px;")
+        colors_label.setObjectName("colorsLabel")
         colors_layout.addWidget(colors_label)
         
         self._colors_spin = QSpinBox()
         self._colors_spin.setRange(1, 10)
         self._colors_spin.setValue(3)
         self._colors_spin.setFixedSize(70, 40)
-        self._colors_spin.setStyleSheet(Styles.spin_box())
+        self._colors_spin.setObjectName("colorsSpin")
         colors_layout.addWidget(self._colors_spin)
         colors_layout.addStretch()
         
@@ -282,7 +359,7 @@ class MainWindow(QMainWindow):
         )
         self._run_btn.setFont(Fonts.subtitle())
         self._run_btn.setCursor(Qt.PointingHandCursor)
-        self._run_btn.setStyleSheet(Styles.action_button_primary())
+        self._run_btn.setObjectName("actionPrimary")
         self._run_btn.clicked.connect(self._run_klee)
         layout.addWidget(self._run_btn)
         
@@ -294,7 +371,7 @@ class MainWindow(QMainWindow):
         )
         self._code_btn.setFont(Fonts.subtitle())
         self._code_btn.setCursor(Qt.PointingHandCursor)
-        self._code_btn.setStyleSheet(Styles.action_button_secondary())
+        self._code_btn.setObjectName("actionSecondary")
         self._code_btn.clicked.connect(self._show_code)
         layout.addWidget(self._code_btn)
         
@@ -302,10 +379,17 @@ class MainWindow(QMainWindow):
         
     def _connect_signals(self):
         """Connect signals to slots."""
-        self.graph_scene.graph_changed.connect(self._on_graph_changed)
+        self.graph_scene.graph_changed.connect(self._schedule_graph_change)
         self.graph_scene.undo_manager.add_change_callback(self._update_undo_redo_state)
-        self.tree_view.leaf_clicked.connect(lambda _, col: self.apply_coloring_to_graph(col))
         
+    def _on_leaf_clicked(self, _node_id: int, coloring: List[int]):
+        """Apply the coloring of a clicked tree leaf to the graph."""
+        self.apply_coloring_to_graph(coloring)
+
+    def _on_tree_layout_failed(self, msg: str):
+        logger.error("Search tree layout failed: %s", msg)
+        self.statusBar().showMessage(f"Search tree could not be drawn: {msg}")
+
     # Tool Management
     def _set_tool(self, tool: Tool):
         """Set the current tool."""
@@ -325,12 +409,10 @@ class MainWindow(QMainWindow):
     def _undo(self):
         """Undo last action."""
         self.graph_scene.undo()
-        self._generated_code = None
         
     def _redo(self):
         """Redo last undone action."""
         self.graph_scene.redo()
-        self._generated_code = None
         
     def _update_undo_redo_state(self):
         """Update undo/redo button states."""
@@ -347,9 +429,20 @@ class MainWindow(QMainWindow):
         self.graph_scene.clear_graph()
         self._colorings.clear()
         self._generated_code = None
-        self.tree_view.clear_tree() 
+        if self.tree_view is not None:
+            self.tree_view.clear_tree()
         self.statusBar().showMessage("Graph cleared")
                 
+    def _schedule_graph_change(self):
+        """Handle graph_changed once per event-loop turn, however often it fires."""
+        self._graph_change_timer.start()
+
+    def _flush_graph_change(self):
+        """Run a pending graph change handler now."""
+        if self._graph_change_timer.isActive():
+            self._graph_change_timer.stop()
+            self._on_graph_changed()
+
     def _on_graph_changed(self):
         """Handle graph structure changes."""
         self._cancel_klee_execution()  # Ensure any running KLEE process is stopped
@@ -361,7 +454,9 @@ class MainWindow(QMainWindow):
         self._generated_code = None
         self._node_id_mapping = {}
         self._reverse_mapping = {}
-        self.tree_view.clear_tree() 
+        self._klee_fingerprint = None
+        if self.tree_view is not None:
+            self.tree_view.clear_tree()
             
     # Code Generation
     def _generate_code(self, blocked: List[List[int]] = None) -> str:
@@ -372,17 +467,43 @@ class MainWindow(QMainWindow):
             remapped_edges = self._remap_edges(original_edges, self._node_id_mapping)
         else:
             remapped_edges = original_edges
-
-        generator = CodeGenerator(
-            num_nodes = self.graph_scene.node_count,
-            edges = remapped_edges,
-            num_colors = self._colors_spin.value(),
-            blocked = blocked or []
+        blocked = blocked or []
+
+        # Everything the generated code depends on; an undo followed by a redo,
+        # or any edit that restores the same graph, reuses the previous code
+        fingerprint = (
+            self.graph_scene.node_count,
+            tuple(remapped_edges),
+            self._colors_spin.value(),
+            tuple(map(tuple, blocked)),
         )
-        return generator.c_code
+        if self._code_cache is not None and self._code_cache[0] == fingerprint:
+            return self._code_cache[1]
+
+        if self._code_generator is None:
+            from klee.code_generator import CodeGenerator
+            self._code_generator = CodeGenerator(
+                num_nodes = self.graph_scene.node_count,
+                edges = remapped_edges,
+                num_colors = self._colors_spin.value(),
+                blocked = blocked
+            )
+        else:
+            self._code_generator.update(
+                num_nodes = self.graph_scene.node_count,
+                edges = remapped_edges,
+                num_colors = self._colors_spin.value(),
+                blocked = blocked
+            )
+        code = self._code_generator.c_code
+        self._code_cache = (fingerprint, code)
+        return code
   
     def _show_code(self):
         """Display the generated KLEE C code in console."""
+        if not self._ready:
+            return
+        self._flush_graph_change()
         if self.graph_scene.node_count == 0:
             QMessageBox.warning(self, "No Graph", "Please create a graph first.")
             return
@@ -393,17 +514,11 @@ class MainWindow(QMainWindow):
         
         self._generated_code = self._generate_code(blocked=self._colorings)
 
-        if self._code_dialog is not None:
-            try:
-                self._code_dialog.set_code(self._generated_code)
-                self._code_dialog.raise_()
-                self._code_dialog.activateWindow()
-                return
-            except RuntimeError:
-                self._code_dialog = None  
-        
-        self._code_dialog = CodeViewerDialog(self._generated_code, parent=self)
-        self._code_dialog.destroyed.connect(lambda: setattr(self, "_code_dialog", None))
+        # One dialog for the app lifetime; closing it only hides it
+        if self._code_dialog is None:
+            self._code_dialog = CodeViewerDialog("", parent=self)
+
+        self._code_dialog.set_code(self._generated_code)
         self._code_dialog.show()
         self._code_dialog.raise_()
         self._code_dialog.activateWindow()
@@ -429,6 +544,9 @@ class MainWindow(QMainWindow):
     # KLEE Execution
     def _run_klee(self):
         """Run KLEE to find graph colorings."""
+        if not self._ready:
+            return
+        self._flush_graph_change()
         if self.graph_scene.node_count == 0:
             QMessageBox.warning(self, "No Graph", "Please create a graph first.")
             return
@@ -443,76 +561,127 @@ class MainWindow(QMainWindow):
         # Build tree immediately (UI) - keep UI call in main thread
         leaf_depth = self.graph_scene.node_count
         k = max(1, self._colors_spin.value())
-        if hasattr(self, "tree_view") and self.tree_view is not None:
-            built = self.tree_view.build_full_tree(num_nodes=leaf_depth, k=k, viable_colorings=None)
+        if self.tree_view is not None:
+            if self.tree_view.has_tree_shape(leaf_depth, k):
+                # Same tree as the last run: only clear the previous results
+                self.tree_view.reset_viability()
+                built = True
+            else:
+                # Only sizes the tree here; layout and items follow asynchronously
+                built = self.tree_view.build_full_tree(num_nodes=leaf_depth, k=k, viable_colorings=None)
             if not built:
                 QMessageBox.warning(self, "Tree Too Large", "The search tree is too large to render.\nUpper limit is 2000 leaves.\nKLEE not run.")
                 return
 
+        # Remap edges to consecutive node IDs
+        original_edges = self.graph_scene.get_edges_as_tuples()
+        remapped_edges = self._remap_edges(original_edges, self._node_id_mapping)
+        fingerprint = (leaf_depth, tuple(remapped_edges), self._colors_spin.value())
+        self._klee_fingerprint = fingerprint
+
         # Disable button during execution
         self._run_btn.setEnabled(False)
         self._run_btn.setText("Running...")
         self.statusBar().showMessage("Running KLEE...")
-        QApplication.processEvents()
 
-        # Remap edges to consecutive node IDs
-        original_edges = self.graph_scene.get_edges_as_tuples()
-        remapped_edges = self._remap_edges(original_edges, self._node_id_mapping)
+        # Start on the next event-loop turn so the UI repaints first
+        QTimer.singleShot(0, lambda: self._start_klee_worker(fingerprint, remapped_edges))
+
+    def _start_klee_worker(self, fingerprint: tuple, remapped_edges: List[Tuple[int, int]]):
+        """Start the KLEE worker scheduled by _run_klee, or replay cached results."""
+        if fingerprint != self._klee_fingerprint:
+            return  # Graph changed before the run started
+
+        # Filled again batch by batch by _add_found_colorings
+        self._colorings = []
+
+        # Same graph and colors as an earlier finished run: replay its results
+        cached = self._klee_cache.get(fingerprint)
+        if cached is not None:
+            self._klee_cache.move_to_end(fingerprint)
+            self._replay_klee_results(fingerprint, cached)
+            return
 
         # Start worker
-        worker = KleeWorker(num_nodes=leaf_depth,
+        worker = KleeWorker(num_nodes=fingerprint[0],
                             edges=remapped_edges,
-                            num_colors=self._colors_spin.value())
+                            num_colors=fingerprint[2])
 
         self._active_worker = worker
 
-        worker.signals.found.connect(self._on_klee_found_coloring)
-        worker.signals.finished.connect(self._on_klee_finished)
-        worker.signals.error.connect(self._on_klee_error)
-        worker.signals.cancelled.connect(self._on_klee_cancelled)
-
-        self._thread_pool.start(worker)
+        # Signals are emitted from a pool thread; slots run in the UI thread
+        worker.signals.found_batch.connect(self._on_klee_found_batch, Qt.QueuedConnection)
+        worker.signals.finished.connect(self._on_klee_finished, Qt.QueuedConnection)
+        worker.signals.error.connect(self._on_klee_error, Qt.QueuedConnection)
+        worker.signals.cancelled.connect(self._on_klee_cancelled, Qt.QueuedConnection)
 
-    def _on_klee_found_coloring(self, coloring: List[int]):
-        """Handle one coloring emitted by worker (runs in main thread)."""
+        # Reject instead of queuing when every KLEE slot is busy
+        if not self._thread_pool.tryStart(worker):
+            self._active_worker = None
+            self._run_btn.setEnabled(True)
+            self._run_btn.setText("RUN KLEE")
+            self.statusBar().showMessage("KLEE is busy, try again when a previous run has stopped")
+
+    def _replay_klee_results(self, fingerprint: tuple, colorings: List[List[int]]):
+        """Feed cached colorings through the same path as a live KLEE run."""
+        if fingerprint != self._klee_fingerprint:
+            return  # Graph changed before the replay ran
+        self._add_found_colorings(colorings)
+        self._on_klee_finished(len(colorings))
+
+    def _on_klee_found_batch(self, colorings: List[List[int]]):
+        """Handle a batch of colorings emitted by worker (runs in main thread)."""
         if self._active_worker is None:
             return # Ignore if no active worker (e.g. after cancellation)
+        # Coalesce batches arriving in quick succession into one UI update
+        self._pending_found.extend(colorings)
+        if not self._found_flush_timer.isActive():
+            self._found_flush_timer.start()
+
+    def _flush_found_colorings(self):
+        """Apply all pending colorings in one pass: data first, then one view update."""
+        self._found_flush_timer.stop()
+        if not self._pending_found:
+            return
+        pending, self._pending_found = self._pending_found, []
+        self._add_found_colorings(pending)
+        self.statusBar().showMessage(f"Running KLEE... {len(self._colorings)} coloring(s) found")
 
+    def _add_found_colorings(self, colorings: List[List[int]]):
+        """Validate found colorings and show them in the code dialog and tree."""
         # Validate and store
-        if not self.is_valid_coloring(coloring):
+        valid = [c for c in colorings if self.is_valid_coloring(c)]
+        if not valid:
             return
 
-        logger.info("Found coloring %s", coloring)
+        logger.info("Found %d coloring(s)", len(valid))
         num_nodes = self.graph_scene.node_count
         num_colors = self._colors_spin.value()
         
         # Add to colorings list
-        self._colorings.append(coloring)
+        self._colorings.extend(valid)
         
         # Update generated code with current blocked colorings
         self._generated_code = self._generate_code(blocked=self._colorings)
         
-        # Update code dialog if it's open
-        if self._code_dialog is not None:
-            try:
-                self._code_dialog.set_code(self._generated_code)
-            except RuntimeError:
-                self._code_dialog = None
-
-        # Update tree view via its public API 
-        if hasattr(self, "tree_view") and self.tree_view is not None:
-            try:
-                leaf_node_id = self.tree_view.get_leaf_node_id(coloring, num_colors, num_nodes)  
-            except Exception:
-                leaf_node_id = None
-            self.tree_view.mark_coloring_viable(coloring, k=max(1, self._colors_spin.value()), depth=self.graph_scene.node_count)
-            if leaf_node_id is not None:
-                self.tree_view.store_coloring(leaf_node_id, coloring)
-
-    def _on_klee_finished(self, all_colorings: List[List[int]]):
-        valid_colorings = [col for col in all_colorings if self.is_valid_coloring(col)]
-        logger.info("KLEE finished, total %d", len(valid_colorings))
-        self._colorings = valid_colorings
+        # Update code dialog if it's open; a hidden one is refreshed when shown
+        if self._code_dialog is not None and self._code_dialog.isVisible():
+            self._code_dialog.set_code(self._generated_code)
+
+        # Update tree view via its public API, one repaint per batch
+        if self.tree_view is not None:
+            self.tree_view.apply_colorings_batch(valid, k=max(1, num_colors), depth=num_nodes)
+
+    def _on_klee_finished(self, count: int):
+        self._flush_found_colorings()
+        # self._colorings already holds the validated colorings from every batch
+        valid_colorings = self._colorings
+        logger.info("KLEE finished, total %d (%d reported)", len(valid_colorings), count)
+        if self._klee_fingerprint is not None:
+            self._klee_cache[self._klee_fingerprint] = list(valid_colorings)
+            self._klee_cache.move_to_end(self._klee_fingerprint)
+            while len(self._klee_cache) > KLEE_CACHE_SIZE:
+                self._klee_cache.popitem(last=False)
         self._run_btn.setEnabled(True)
         self._run_btn.setText("RUN KLEE")
         if valid_colorings:
@@ -523,6 +692,7 @@ class MainWindow(QMainWindow):
             self.graph_scene.reset_colors()
 
     def _on_klee_error(self, msg: str):
+        self._flush_found_colorings()  # Keep what was found before the error
         logger.error("KLEE worker error: %s", msg)
         QMessageBox.critical(self, "KLEE Error", msg)
         self._run_btn.setEnabled(True)
@@ -534,76 +704,97 @@ class MainWindow(QMainWindow):
         self._run_btn.setText("RUN KLEE")
 
     def _cancel_klee_execution(self):
+        self._found_flush_timer.stop()
+        self._pending_found.clear()
         if self._active_worker is not None:
             self._active_worker.cancel()
             self._active_worker = None
         
         self._on_klee_cancelled()
 
+    @contextmanager
+    def _batched_graph_repaint(self):
+        """Suspend graph view painting and scene signals; repaint once on exit."""
+        view = self.graph_view
+        view.setUpdatesEnabled(False)
+        self.graph_scene.blockSignals(True)
+        try:
+            yield
+        finally:
+            self.graph_scene.blockSignals(False)
+            view.setUpdatesEnabled(True)
+            view.viewport().update()
+
     def apply_coloring_to_graph(self, coloring: List[int]):
         """Apply a coloring solution to the graph nodes."""
         # coloring[i] is the color for consecutive node index i
         # We need to map back to actual node IDs
-        for new_id, color_value in enumerate(coloring):
-            # Find node with id=idx and set its color
-            # Get the actual node ID from the reverse mapping
-            if new_id in self._reverse_mapping:
-                actual_node_id = self._reverse_mapping[new_id]
-                # Find node with actual ID and set its color
-                for node in self.graph_scene._nodes:
-                    if node.id == actual_node_id:
-                        node.color = color_value
-                        break
-        
-        # Update all node visuals
-        for node_item in self.graph_scene._node_items.values():
-            node_item.update_appearance()
+        reverse_mapping = self._reverse_mapping
+        set_node_color = self.graph_scene.set_node_color
+        with self._batched_graph_repaint():
+            for new_id, color_value in enumerate(coloring):
+                actual_node_id = reverse_mapping.get(new_id)
+                if actual_node_id is not None:
+                    # Only nodes whose color changes are replaced and repainted
+                    set_node_color(actual_node_id, color_value)
         
         self.statusBar().showMessage(f"Applied coloring: {coloring}")
     
     def clear_graph_coloring(self):
         """Clear all node colors from the graph."""
-        for node in self.graph_scene._nodes:
-            node.color = -1  # Reset to uncolored
-        
-        # Update all node visuals
-        for node_item in self.graph_scene._node_items.values():
-            node_item.update_appearance()
-
-        self.graph_scene.reset_edge_styles()
+        # Repaints only the nodes that were colored
+        with self._batched_graph_repaint():
+            self.graph_scene.reset_colors()
+            self.graph_scene.reset_edge_styles()
         
         self.statusBar().showMessage("Coloring cleared")
             
-    def find_conflict_edges(self, coloring):
-        """Return a list of all conflicting edges (u,v)."""
-        conflicts = []
-
-        # Use remapped edges for checking conflicts
-        original_edges = self.graph_scene.get_edges_as_tuples()
-
-        for (u, v) in original_edges:
-            # Map original node IDs to consecutive indices used in coloring
-            if self._node_id_mapping:
-                u_mapped = self._node_id_mapping.get(u)
-                v_mapped = self._node_id_mapping.get(v)
-                if u_mapped is None or v_mapped is None:
-                    continue  # Skip if node not in mapping
+    def _mapped_edges(self) -> Tuple[array, array, Tuple[Tuple[int, int], ...], int]:
+        """
+        Edges in coloring index space as parallel arrays (U, V), the matching
+        original edges as canonical (min, max) pairs, and the shortest coloring
+        length covering every index.
+        Cached until the scene's edges or the node id mapping are replaced.
+        """
+        sources, targets = self.graph_scene.get_edges_soa()
+        mapping = self._node_id_mapping
+        cache = self._mapped_edges_cache
+        if cache is None or cache[0] is not sources or cache[1] is not mapping:
+            if mapping:
+                # Skip edges whose nodes are not in the mapping
+                kept = [(u, v) for u, v in zip(sources, targets) if u in mapping and v in mapping]
+                U = array('l', [mapping[u] for u, _ in kept])
+                V = array('l', [mapping[v] for _, v in kept])
             else:
-                u_mapped, v_mapped = u, v
-            
-            # Check bounds
-            if u_mapped >= len(coloring) or v_mapped >= len(coloring):
-                continue
-                
-            if coloring[u_mapped] == coloring[v_mapped]:
-                conflicts.append((u, v))  # Return original IDs for highlighting
-
-        return conflicts
+                U, V = sources, targets
+                kept = zip(sources, targets)
+            originals = tuple((u, v) if u <= v else (v, u) for u, v in kept)
+            limit = max(max(U, default=-1), max(V, default=-1)) + 1
+            cache = self._mapped_edges_cache = (sources, mapping, (U, V, originals, limit))
+        return cache[2]
+
+    def find_conflict_edges(self, coloring) -> FrozenSet[Tuple[int, int]]:
+        """Return all conflicting edges as canonical (min, max) pairs of original IDs."""
+        U, V, originals, limit = self._mapped_edges()
+        if len(coloring) >= limit:
+            # Every index is in range: compare endpoint colors with C-level iterators
+            get = coloring.__getitem__
+            return frozenset(e for e, same in zip(originals, map(eq, map(get, U), map(get, V))) if same)
+        # Out-of-range nodes are skipped
+        n = len(coloring)
+        return frozenset(e for a, b, e in zip(U, V, originals)
+                         if a < n and b < n and coloring[a] == coloring[b])
 
     def is_valid_coloring(self, coloring):
-        """Check if a coloring is valid (has no conflicts)."""
-        return len(self.find_conflict_edges(coloring)) == 0
-
-    def highlight_conflict_edges(self, conflicts):
+        """Check if a coloring is valid (has no conflicts); stops at the first conflict."""
+        U, V, _, limit = self._mapped_edges()
+        if len(coloring) >= limit:
+            get = coloring.__getitem__
+            return not any(map(eq, map(get, U), map(get, V)))
+        n = len(coloring)
+        return not any(a < n and b < n and coloring[a] == coloring[b]
+                       for a, b in zip(U, V))
+
+    def highlight_conflict_edges(self, conflicts: FrozenSet[Tuple[int, int]]):
         """Highlight all conflicting edges at once."""
         self.graph_scene.highlight_edges(conflicts)
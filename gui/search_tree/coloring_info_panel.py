@@ -1,7 +1,7 @@
 from typing import List, Dict, Tuple, Optional
 
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QBrush, QPen, QPainter, QColor
+from PyQt5.QtGui import QBrush, QPen, QPainter, QColor, QPixmap
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QFrame, 
     QHBoxLayout, QSizePolicy, QGraphicsDropShadowEffect
@@ -9,28 +9,60 @@ from PyQt5.QtWidgets import (
 
 from models.settings import *
 
+# Rasterized circles shared by all ColorCircleWidgets, keyed by (rgba, size)
+_CIRCLE_PIXMAPS: Dict[Tuple[int, int], QPixmap] = {}
+
+def _circle_pixmap(color: QColor, size: int) -> QPixmap:
+    """Return the antialiased circle for color, rendering it on first use."""
+    key = (color.rgba(), size)
+    pixmap = _CIRCLE_PIXMAPS.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        # Filled circle with border
+        painter.setBrush(QBrush(color))
+        painter.setPen(QPen(color.darker(130), 1))
+        painter.drawEllipse(1, 1, size - 2, size - 2)
+        painter.end()
+        _CIRCLE_PIXMAPS[key] = pixmap
+    return pixmap
+
+# Color label stylesheets, built once per color index
+_COLOR_LABEL_STYLESHEETS: Dict[int, str] = {}
+
+def _color_label_stylesheet(color_value: int) -> str:
+    """Return the bold color label stylesheet for a color index."""
+    stylesheet = _COLOR_LABEL_STYLESHEETS.get(color_value)
+    if stylesheet is None:
+        stylesheet = (
+            f"color: {get_display_color(color_value).darker(120).name()}; "
+            f"font-size: 11px; font-weight: bold;"
+        )
+        _COLOR_LABEL_STYLESHEETS[color_value] = stylesheet
+    return stylesheet
+
 class ColorCircleWidget(QWidget):
     """Small colored circle widget for displaying node colors."""
     
     def __init__(self, color: QColor, size: int = 16, parent=None):
         super().__init__(parent)
-        self._color = color
         self._size = size
         self.setFixedSize(size, size)
-    
+        self._color = color
+        self._pixmap = _circle_pixmap(color, size)
+
     def set_color(self, color: QColor):
         """Update the circle color."""
+        if color == self._color:
+            return
         self._color = color
+        self._pixmap = _circle_pixmap(color, self._size)
         self.update()
     
     def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Draw filled circle with border
-        painter.setBrush(QBrush(self._color))
-        painter.setPen(QPen(self._color.darker(130), 1))
-        painter.drawEllipse(1, 1, self._size - 2, self._size - 2)
+        QPainter(self).drawPixmap(0, 0, self._pixmap)
 
 class NodeColorRow(QWidget):
     """
@@ -43,6 +75,7 @@ class NodeColorRow(QWidget):
     def __init__(self, node_id: int, parent=None):
         super().__init__(parent)
         self.node_id = node_id
+        self._color_value: Optional[int] = None
         
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 2, 0, 2)
@@ -67,6 +100,8 @@ class NodeColorRow(QWidget):
     
     def set_node_id(self, node_id: int):
         """Update the displayed node ID."""
+        if node_id == self.node_id:
+            return
         self.node_id = node_id
         self.node_label.setText(f"Node {node_id}:")
 
@@ -74,15 +109,16 @@ class NodeColorRow(QWidget):
         """
         Update the display for a given color value.
         """
+        if color_value == self._color_value:
+            return
+        self._color_value = color_value
+
         color_name = get_color_name(color_value)
         display_color = get_display_color(color_value)
         
         self.color_circle.set_color(display_color)
         self.color_label.setText(f"{color_name} ({color_value})")
-        self.color_label.setStyleSheet(
-            f"color: {display_color.darker(120).name()}; "
-            f"font-size: 11px; font-weight: bold;"
-        )
+        self.color_label.setStyleSheet(_color_label_stylesheet(color_value))
 
 class ColoringInfoPanel(QFrame):
     """
@@ -101,13 +137,13 @@ class ColoringInfoPanel(QFrame):
         self._reverse_mapping: Optional[Dict[int, int]] = None
 
         # Styling - white background with dark border
-        self.setStyleSheet(self.setStyleSheet(f"""
+        self.setStyleSheet(f"""
             #coloringInfoPanel {{
                 background-color: rgba(255, 255, 255, 0.95);
                 border: 2px solid {COLOR_BORDER};
                 border-radius: 6px;
             }}
-        """))
+        """)
         
         # Shadow effect for depth
         shadow = QGraphicsDropShadowEffect()
@@ -170,8 +206,9 @@ class ColoringInfoPanel(QFrame):
         self.nodes_layout.setSpacing(2)
         self.main_layout.addWidget(self.nodes_container)
         
-        # Node rows list
+        # Node rows list (rows past _visible_rows are hidden and kept for reuse)
         self._node_rows: List[NodeColorRow] = []
+        self._visible_rows = 0
         
         # Initially hidden
         self.hide()
@@ -183,75 +220,64 @@ class ColoringInfoPanel(QFrame):
         self.setMaximumHeight(800)  # Reasonable max height
     
     def clear(self):
-        """Clear the panel and hide it."""
+        """Clear the panel and hide it. Header widgets and node rows are reused."""
         self._coloring = None
         self._node_id_mapping = None
         self._reverse_mapping = None
 
-        self.status_value.setText("—")
-        self.status_value.setStyleSheet(get_status_stylesheet(COLOR_CLEAR_STATUS))
-        
-        self.conflict_value.setText("—")
-        self.conflict_text.hide()
-        self.conflict_value.hide()
+        self._set_label(self.status_value, "—", get_status_stylesheet(COLOR_CLEAR_STATUS))
+        self._hide_conflict()
 
-        # Clear node rows
-        for row in self._node_rows:
-            self.nodes_layout.removeWidget(row)
-            row.deleteLater()
-        self._node_rows.clear()
+        # Hide node rows in one layout pass; they are kept for the next coloring
+        self.nodes_container.setUpdatesEnabled(False)
+        for row in self._node_rows[:self._visible_rows]:
+            row.hide()
+        self._visible_rows = 0
+        self.nodes_container.setUpdatesEnabled(True)
         
         self.hide()
     
     def _update_panel_height(self):
-        """Calculate and set appropriate height based on content."""
-        # Calculate needed height
-        # Title height
-        height = 20  # title
-        height += 6  # spacing
-        height += 20  # status line
-        height += 6  # spacing after status
-        
-        # Conflict line (if visible)
-        if self.conflict_text.isVisible():
-            height += 25  # approximate for conflict text
-            height += 6   # spacing
-        
-        # Separator
-        height += 1 + 6
-        
-        # Rows height
-        row_height = 24  # approximate height per row (text height + padding)
-        height += len(self._node_rows) * row_height + 4
-        
-        # Add padding
-        height += 6
-        
-        # Set height
-        self.setMinimumHeight(height)
-        self.resize(self.width(), height)
-        self.adjustSize()
+        """Resize the panel once to the height its layout needs at the current width."""
+        # Refresh the layout's size hints so shrinking is not clamped
+        self.main_layout.activate()
+        # The word-wrapped conflict line makes the height depend on the width
+        if self.hasHeightForWidth():
+            height = self.heightForWidth(self.width())
+        else:
+            height = self.sizeHint().height()
+        height = max(height, self.minimumSizeHint().height())
+        self.resize(self.width(), min(height, self.maximumHeight()))
+
+    @staticmethod
+    def _set_label(label: QLabel, text: str, stylesheet: Optional[str] = None):
+        """Set label text and stylesheet, skipping values that are unchanged."""
+        if label.text() != text:
+            label.setText(text)
+        if stylesheet is not None and label.styleSheet() != stylesheet:
+            label.setStyleSheet(stylesheet)
+
+    def _hide_conflict(self):
+        """Reset and hide the conflict line."""
+        self._set_label(self.conflict_value, "—")
+        self.conflict_text.hide()
+        self.conflict_value.hide()
 
     def _set_status(self, status_text: str, color: str, show_conflict: bool = False):
         """Set status display with color."""
-        self.status_value.setText(status_text)
-        self.status_value.setStyleSheet(get_status_stylesheet(color))
+        self._set_label(self.status_value, status_text, get_status_stylesheet(color))
         
         if not show_conflict:
-            self.conflict_value.setText("—")
-            self.conflict_text.hide()
-            self.conflict_value.hide()
+            self._hide_conflict()
 
     def _set_conflict(self, coloring: List[int], conflict):
         """Display conflict information."""
         if not conflict:
-            self.conflict_value.setText("—")
-            self.conflict_text.hide()
-            self.conflict_value.hide()
+            self._hide_conflict()
             return
         
-        # Normalize to list of tuples
-        conflicts = [conflict] if isinstance(conflict, tuple) else list(conflict)
+        # Normalize to list of tuples (sets are sorted for a stable display order)
+        conflicts = [conflict] if isinstance(conflict, tuple) else sorted(conflict)
         
         # Build readable list using proper index mapping
         parts = []
@@ -274,40 +300,46 @@ class ColoringInfoPanel(QFrame):
             parts.append(f"({u}-{v}) same color {color_value}")
 
         if parts:
-            self.conflict_value.setText("; ".join(parts))
-            self.conflict_value.setStyleSheet(get_conflict_stylesheet())
+            self._set_label(self.conflict_value, "; ".join(parts), get_conflict_stylesheet())
             self.conflict_text.show()
             self.conflict_value.show()
         else:
-            self.conflict_value.setText("—")
-            self.conflict_text.hide()
-            self.conflict_value.hide()
+            self._hide_conflict()
 
     def _update_node_rows(self, coloring: List[int]):
-        """Update node rows display."""
-        # Clear existing rows
-        for row in self._node_rows:
-            self.nodes_layout.removeWidget(row)
-            row.deleteLater()
-        self._node_rows.clear()
-        
+        """Update node rows display, reusing existing row widgets."""
         # Build reverse mapping if we have node_id_mapping
         if self._node_id_mapping:
             self._reverse_mapping = {v: k for k, v in self._node_id_mapping.items()}
         else:
             self._reverse_mapping = None
 
-        # Add new rows
+        # Suspend repaints so the rows are laid out once, not per row
+        self.nodes_container.setUpdatesEnabled(False)
+
+        # Create only the rows we don't have yet
+        for idx in range(len(self._node_rows), len(coloring)):
+            row = NodeColorRow(idx)
+            self.nodes_layout.addWidget(row)
+            self._node_rows.append(row)
+
         for idx, color_value in enumerate(coloring):
             # Get original node ID if mapping exists
             if self._reverse_mapping:
                 original_node_id = self._reverse_mapping.get(idx, idx)
             else:
                 original_node_id = idx
-            row = NodeColorRow(original_node_id)
+            row = self._node_rows[idx]
+            row.set_node_id(original_node_id)
             row.set_coloring(color_value)
-            self.nodes_layout.addWidget(row)
-            self._node_rows.append(row)
+            row.show()
+
+        # Hide leftover rows instead of deleting them
+        for row in self._node_rows[len(coloring):]:
+            row.hide()
+        self._visible_rows = len(coloring)
+        self.nodes_container.setUpdatesEnabled(True)
+        self.nodes_container.updateGeometry()
         
         self._update_panel_height()
         self.show()
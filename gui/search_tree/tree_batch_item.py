@@ -0,0 +1,237 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Optional, Sequence
+
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QBrush, QPen, QFont, QStaticText, QTransform, QPainter, QPixmap, QPixmapCache
+from PyQt5.QtWidgets import QGraphicsItem
+
+from models.settings import Theme, VIABLE_COLOR, INVALID_COLOR, INNER_NODE_DOT_RADIUS
+
+# Node states
+NEUTRAL = 0
+VIABLE = 1
+INVALID = 2
+
+_STATE_BRUSHES = {
+    NEUTRAL: QBrush(Qt.lightGray),
+    VIABLE: QBrush(VIABLE_COLOR),
+    INVALID: QBrush(INVALID_COLOR),
+}
+_STATE_PENS = {
+    NEUTRAL: QPen(Theme.BORDER_LIGHT, 2),
+    VIABLE: QPen(VIABLE_COLOR.darker(150), 2),
+    INVALID: QPen(INVALID_COLOR.darker(150), 2),
+}
+_DOT_BRUSH = QBrush(Theme.EDGE_TREE)
+_LABEL_PEN = QPen(Qt.black)
+_SELECTION_PEN = QPen(Qt.black, 0, Qt.DashLine)
+
+# Node sprites are drawn at 2x so they stay sharp when the view zooms in
+_SPRITE_SCALE = 2
+
+def _node_sprite(state: int, radius: float) -> QPixmap:
+    """Prerendered node circle for a state and radius, kept in QPixmapCache."""
+    key = f"tree/{state}/{radius}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        half = radius + 1  # The 2px border reaches 1px outside the circle
+        size = int(2 * half * _SPRITE_SCALE)
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(_SPRITE_SCALE, _SPRITE_SCALE)
+        painter.translate(half, half)
+        painter.setBrush(_STATE_BRUSHES[state])
+        painter.setPen(_STATE_PENS[state])
+        painter.drawEllipse(QRectF(-radius, -radius, 2 * radius, 2 * radius))
+        painter.end()
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+class TreeBatchItem(QGraphicsItem):
+    """
+    Every node of the search tree, drawn by a single scene item.
+    Node ids are assigned level by level, so per-node data lives in parallel
+    arrays indexed by node id: x, y and state (NEUTRAL, VIABLE or INVALID).
+    With inner_dots set, inner nodes are drawn as small unlabeled dots and only
+    the leaves as full labeled circles.
+    """
+    # Label font, created on first paint (needs a running QApplication)
+    _font: Optional[QFont] = None
+    # depth -> (laid out label, offset from the node center), shared by all trees
+    _labels: Dict[int, tuple] = {}
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float], level_starts: Sequence[int], radius: float,
+                 inner_dots: bool = False):
+        """
+        level_starts holds the first node id of every level followed by the node count.
+        """
+        super().__init__()
+        self._xs = xs
+        self._ys = ys
+        self._level_starts = level_starts
+        self._radius = radius
+        self._inner_dots = inner_dots
+        self._states = bytearray(len(xs))
+        self._selected: Optional[int] = None
+
+        margin = radius + 2
+        if len(xs):
+            self._rect = QRectF(
+                min(xs) - margin, min(ys) - margin,
+                max(xs) - min(xs) + 2 * margin, max(ys) - min(ys) + 2 * margin
+            )
+        else:
+            self._rect = QRectF()
+
+        # Clicks are hit-tested by the view
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setZValue(1)  # Nodes above edges
+        # Repaint from a pixmap while panning; state changes invalidate only the node's rect
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        # paint only draws the nodes inside option.exposedRect
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    @property
+    def node_count(self) -> int:
+        return len(self._xs)
+
+    @property
+    def leaf_range(self) -> range:
+        """Node ids of the leaf level."""
+        return range(self._level_starts[-2], self._level_starts[-1])
+
+    def depth_of(self, node_id: int) -> int:
+        return bisect_right(self._level_starts, node_id) - 1
+
+    def index_in_level(self, node_id: int) -> int:
+        return node_id - self._level_starts[self.depth_of(node_id)]
+
+    def state(self, node_id: int) -> int:
+        return self._states[node_id]
+
+    def set_state(self, node_id: int, state: int):
+        if self._states[node_id] != state:
+            self._states[node_id] = state
+            self.update(self._node_rect(node_id))
+
+    def set_states(self, node_ids: Iterable[int], state: int):
+        """Set the state of many nodes with a single repaint."""
+        states = self._states
+        for node_id in node_ids:
+            states[node_id] = state
+        self.update()
+
+    def set_leaf_states(self, states: bytes):
+        """Set the state of every leaf at once; states[i] is the state of leaf i."""
+        leaves = self.leaf_range
+        if len(states) != len(leaves):
+            raise ValueError(f"Expected {len(leaves)} leaf states, got {len(states)}")
+        self._states[leaves.start:leaves.stop] = states
+        self.update()
+
+    def replace_state(self, old: int, new: int):
+        """Move every node in state old to state new."""
+        self._states = self._states.replace(bytes((old,)), bytes((new,)))
+        self.update()
+
+    def set_selected_node(self, node_id: Optional[int]):
+        if node_id == self._selected:
+            return
+        if self._selected is not None:
+            self.update(self._node_rect(self._selected))
+        self._selected = node_id
+        if node_id is not None:
+            self.update(self._node_rect(node_id))
+
+    def node_at(self, x: float, y: float) -> Optional[int]:
+        """Id of the node whose circle contains the scene point (x, y), or None."""
+        xs, ys, starts = self._xs, self._ys, self._level_starts
+        leaf_level = len(starts) - 2
+        for d in range(leaf_level + 1):
+            start, end = starts[d], starts[d + 1]
+            # Dots get a few pixels of slack so they stay clickable
+            r = self._radius if d == leaf_level or not self._inner_dots else INNER_NODE_DOT_RADIUS + 3
+            if abs(ys[start] - y) > r:
+                continue
+            # x grows along a level, so only the neighbours of x can contain it
+            i = bisect_left(xs, x, start, end)
+            for node_id in (i - 1, i):
+                if start <= node_id < end:
+                    dx = xs[node_id] - x
+                    dy = ys[node_id] - y
+                    if dx * dx + dy * dy <= r * r:
+                        return node_id
+        return None
+
+    def _node_rect(self, node_id: int) -> QRectF:
+        m = self._radius + 2
+        return QRectF(self._xs[node_id] - m, self._ys[node_id] - m, 2 * m, 2 * m)
+
+    @classmethod
+    def _label_font(cls) -> QFont:
+        if cls._font is None:
+            cls._font = QFont("Arial", 10, QFont.Bold)
+        return cls._font
+
+    @classmethod
+    def _label(cls, depth: int) -> tuple:
+        """Static text for a depth label and the offset that centers it on a node."""
+        cached = cls._labels.get(depth)
+        if cached is None:
+            text = QStaticText(str(depth))
+            text.prepare(QTransform(), cls._label_font())
+            size = text.size()
+            cached = cls._labels[depth] = (text, -size.width() / 2, -size.height() / 2)
+        return cached
+
+    def _visible_ids(self, d: int, exposed: QRectF) -> range:
+        """Ids of the level d nodes that overlap the exposed rect."""
+        start, end = self._level_starts[d], self._level_starts[d + 1]
+        m = self._radius + 2
+        y = self._ys[start]
+        if y + m < exposed.top() or y - m > exposed.bottom():
+            return range(0)
+        # x grows along a level, so the visible nodes are one contiguous run
+        xs = self._xs
+        return range(bisect_left(xs, exposed.left() - m, start, end),
+                     bisect_right(xs, exposed.right() + m, start, end))
+
+    def paint(self, painter, option, widget=None):
+        painter.setFont(self._label_font())
+
+        r = self._radius
+        xs, ys, states, starts = self._xs, self._ys, self._states, self._level_starts
+        exposed = option.exposedRect
+        leaf_level = len(starts) - 2
+        first_labeled = 0
+        if self._inner_dots:
+            first_labeled = leaf_level
+            dot = INNER_NODE_DOT_RADIUS
+            painter.setBrush(_DOT_BRUSH)
+            painter.setPen(Qt.NoPen)
+            for d in range(leaf_level):
+                for node_id in self._visible_ids(d, exposed):
+                    painter.drawEllipse(QRectF(xs[node_id] - dot, ys[node_id] - dot, 2 * dot, 2 * dot))
+
+        # Circles are blitted from one sprite per state instead of rasterized per node
+        sprites = {state: _node_sprite(state, r) for state in _STATE_BRUSHES}
+        source = QRectF(sprites[NEUTRAL].rect())
+        half = r + 1
+        painter.setPen(_LABEL_PEN)
+        for d in range(first_labeled, leaf_level + 1):
+            label, dx, dy = self._label(d)
+            for node_id in self._visible_ids(d, exposed):
+                x, y = xs[node_id], ys[node_id]
+                painter.drawPixmap(QRectF(x - half, y - half, 2 * half, 2 * half), sprites[states[node_id]], source)
+                painter.drawStaticText(QPointF(x + dx, y + dy), label)
+
+        if self._selected is not None:
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(_SELECTION_PEN)
+            painter.drawRect(self._node_rect(self._selected).adjusted(1, 1, -1, -1))
@@ -1,31 +1,77 @@
-from typing import Dict, List, Optional, Tuple, Set
+from collections import OrderedDict
+from operator import mul
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from PyQt5.QtCore import Qt, QPointF, pyqtSignal
-from PyQt5.QtGui import QBrush, QPen, QPainter
-from PyQt5.QtWidgets import QGraphicsLineItem, QGraphicsScene, QGraphicsView
+from PyQt5.QtCore import Qt, pyqtSignal, QThreadPool, QTimer
+from PyQt5.QtGui import QBrush, QPen, QPainter, QPainterPath, QOpenGLContext, QSurfaceFormat
+from PyQt5.QtWidgets import QGraphicsPathItem, QGraphicsScene, QGraphicsView, QOpenGLWidget, QWidget
 
-from .tree_node_item import TreeNodeItem
-from models.graph import TreeNode
+from .tree_batch_item import TreeBatchItem, NEUTRAL, VIABLE, INVALID
 from .coloring_info_panel import ColoringInfoPanel
-from models.tree_layout import compute_tree_model_levels_positions, compute_first_leaf_id
+from models.tree_layout import compute_first_leaf_id
+from models.tree_layout_worker import TreeLayoutWorker
 from models.settings import *
 
+# Arrow-key pans and keyboard zoom steps are applied at most once per interval
+PAN_FLUSH_INTERVAL_MS = 16
+ZOOM_FLUSH_INTERVAL_MS = 30
+
+# Tree layouts kept for reuse, keyed by (depth, k, viewport width, viewport height)
+LAYOUT_CACHE_SIZE = 8
+
+# bytes.translate table from a pending-viable mask byte to a leaf state
+_MASK_TO_STATE = bytes((INVALID, VIABLE)) + bytes(254)
+
+_EDGE_PEN = QPen(Theme.EDGE_TREE, 2)
+
+def _opengl_viewport() -> Optional[QWidget]:
+    """An OpenGL viewport for the tree view, or None when OpenGL is disabled or unavailable."""
+    if not TREE_VIEW_OPENGL:
+        return None
+    try:
+        # QOpenGLWidget itself does not fail until it is shown, so probe for a context first
+        if not QOpenGLContext().create():
+            return None
+        viewport = QOpenGLWidget()
+        fmt = QSurfaceFormat()
+        fmt.setSamples(TREE_VIEW_GL_SAMPLES)
+        viewport.setFormat(fmt)
+        return viewport
+    except Exception as e:
+        print(f"[WARN] OpenGL viewport unavailable, using the default one: {e}")
+        return None
+
 class SearchTreeWidget(QGraphicsView):
     """Simple k-ary tree renderer."""
     # Signals
     leaf_clicked = pyqtSignal(int, list)   # node_id, coloring
+    layout_failed = pyqtSignal(str)        # error message
 
     def __init__(self, main_window=None, parent=None):
         self.scene = QGraphicsScene()
+        # The tree is two items (nodes, edges); a BSP index would not pay off
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         super().__init__(self.scene, parent)
         
         self.main_window = main_window
 
+        # A few large items: repainting the whole viewport is cheaper than
+        # tracking dirty regions. Both items set every pen/brush they use.
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
+
+        viewport = _opengl_viewport()
+        if viewport is not None:
+            self.setViewport(viewport)
+
         self.setRenderHint(QPainter.Antialiasing, True)
         self.setBackgroundBrush(QBrush(Theme.BG_CANVAS))
 
-        self._node_items: Dict[int, TreeNodeItem] = {}
-        self._edges: List[QGraphicsLineItem] = []
+        # All tree nodes, drawn by one item; None until the layout is ready
+        self._tree_nodes: Optional[TreeBatchItem] = None
+        # All tree edges as one path
+        self._tree_edges: Optional[QGraphicsPathItem] = None
         self._coloring_map: Dict[int, List[int]] = {}  # Maps leaf's node_id to coloring
 
         # Layout params
@@ -37,6 +83,24 @@ class SearchTreeWidget(QGraphicsView):
         self._tree_k = None  # Number of colors/branching factor
         self._tree_depth = None  # Tree depth
 
+        # Asynchronous build: the layout is computed by a TreeLayoutWorker and
+        # the items are added when it reports back. Results of a superseded
+        # build carry an older generation and are dropped.
+        self._build_generation = 0
+        # Running layout workers by generation; referenced until they report back
+        self._layout_workers: Dict[int, TreeLayoutWorker] = {}
+        # (k, depth) -> (place values k^(depth-1)..k^0, first leaf id)
+        self._leaf_math: Dict[Tuple[int, int], Tuple[List[int], int]] = {}
+        # (depth, k) of the tree currently built or being built, None when empty
+        self._tree_shape: Optional[Tuple[int, int]] = None
+        # Leaves marked viable before the node item exists: one byte per leaf
+        # index, 1 when viable; None while no tree is being built
+        self._pending_viable: Optional[bytearray] = None
+        # (depth, k, view width, view height) -> (layout, edge path); least recently used first
+        self._layout_cache: "OrderedDict[Tuple[int, int, int, int], tuple]" = OrderedDict()
+        # Cache key of the layout being computed
+        self._layout_key: Optional[Tuple[int, int, int, int]] = None
+
         # Enable keyboard control
         self.setFocusPolicy(Qt.StrongFocus)   # Allow widget to receive key presses
         self.setFocus()
@@ -45,18 +109,24 @@ class SearchTreeWidget(QGraphicsView):
         self._zoom_step = 1.15   # Zoom multiplier per step
         self._pan_step = 40      # Pixels per arrow press
 
+        # Key auto-repeat outpaces repaints; pending pans and zoom steps are
+        # accumulated here and applied by a single-shot timer
+        self._pan_dx = 0
+        self._pan_dy = 0
+        self._pan_timer = QTimer(self)
+        self._pan_timer.setSingleShot(True)
+        self._pan_timer.setInterval(PAN_FLUSH_INTERVAL_MS)
+        self._pan_timer.timeout.connect(self._flush_pan)
+        self._pending_zoom = 0
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(ZOOM_FLUSH_INTERVAL_MS)
+        self._zoom_timer.timeout.connect(self._flush_zoom)
+
         # Coloring info panel - positioned in top-right corner
         self._info_panel = ColoringInfoPanel(self)
         self._position_info_panel()
 
-    def _leaf_index_to_coloring(self, leaf_index: int, k: int, n: int) -> List[int]:
-        coloring = [0] * n
-        x = leaf_index
-        for d in range(n - 1, -1, -1):
-            coloring[d] = x % k
-            x //= k
-        return coloring
-
     def _coloring_to_leaf_index(self, coloring: List[int], k: int) -> int:
         """
         Convert a coloring (list of color assignments) to a leaf node index.
@@ -70,14 +140,39 @@ class SearchTreeWidget(QGraphicsView):
             leaf_index = leaf_index * k + c
         return leaf_index
 
+    def _get_leaf_math(self, k: int, depth: int) -> Tuple[List[int], int]:
+        """Place values and first leaf id for a tree shape, computed once per shape."""
+        math = self._leaf_math.get((k, depth))
+        if math is None:
+            powers = [k ** e for e in range(depth - 1, -1, -1)]
+            math = self._leaf_math[(k, depth)] = (powers, compute_first_leaf_id(depth, k))
+        return math
+
+    def _colorings_to_leaf_indices(self, colorings: List[List[int]], k: int, depth: int) -> List[int]:
+        """
+        Leaf index of every coloring, in order.
+        Full-length colorings are a dot product with the shared place values.
+        """
+        powers, _ = self._get_leaf_math(k, depth)
+        return [
+            sum(map(mul, c, powers)) if len(c) == depth else self._coloring_to_leaf_index(c, k)
+            for c in colorings
+        ]
+
     def get_leaf_node_id(self, coloring: List[int], k: int, depth: int) -> int:
         """Get the node_id of the leaf corresponding to a coloring."""
-        leaf_index = self._coloring_to_leaf_index(coloring, k)
-        
-        if depth < 0 or leaf_index < 0:
+        if depth < 0:
             return -1
 
-        first_leaf_id = compute_first_leaf_id(depth, k)
+        powers, first_leaf_id = self._get_leaf_math(k, depth)
+        if len(coloring) == depth:
+            # Dot product with the precomputed place values, evaluated in C
+            leaf_index = sum(map(mul, coloring, powers))
+        else:
+            leaf_index = self._coloring_to_leaf_index(coloring, k)
+
+        if leaf_index < 0:
+            return -1
         return first_leaf_id + leaf_index
     
     def _position_info_panel(self):
@@ -112,131 +207,189 @@ class SearchTreeWidget(QGraphicsView):
         self._info_panel.show_partial_coloring(partial_coloring)
         self._position_info_panel()
     
-    def _get_partial_coloring(self, node_item: 'TreeNodeItem') -> Optional[List[int]]:
+    def _get_partial_coloring(self, node_id: int) -> Optional[List[int]]:
         """
         Extract partial coloring from root to given inner node.
-        Returns list of color assignments for nodes 0 to depth.
+        The path from the root is the base-k representation of the node's
+        index in its level, one digit (child number) per level above it.
         """
-        if self._tree_k is None:
+        if self._tree_k is None or self._tree_nodes is None:
             return None
-        
-        # Traverse up from node to root, collecting depth and index_in_level
-        path = []
-        current = node_item
-        
-        while current is not None:
-            path.append((current.node.depth, current.node.index_in_level))
-            current = current.parent_item
-        
-        # Reverse to get path from root to node
-        path.reverse()
-        
-        # If no path, return None
-        if not path:
-            return None
-        
-        # Use the stored k to extract coloring from the path
-        return self._get_partial_coloring_from_path(path, self._tree_k)
-    
-    def _get_partial_coloring_from_path(self, path: List[Tuple[int, int]], k: int) -> List[int]:
-        """
-        Convert a path (list of (depth, index_in_level) tuples) to partial coloring.
-        """
-        if not path:
-            return []
-        
-        max_depth = path[-1][0]
-        coloring = [0] * (max_depth)
-        
-        # At each level, compute which child branch we took
-        for i in range(1, len(path)):
-            prev_depth, prev_idx = path[i - 1]
-            _ , curr_idx = path[i]
-    
-            # Which child of prev_idx leads to curr_idx?
-            # Children of node with index_in_level p are at indices p*k, p*k+1, ..., p*k+k-1
-            child_number = curr_idx - prev_idx * k
-            coloring[prev_depth] = child_number
-        
+
+        k = self._tree_k
+        depth = self._tree_nodes.depth_of(node_id)
+        index = self._tree_nodes.index_in_level(node_id)
+        coloring = [0] * depth
+        for d in range(depth - 1, -1, -1):
+            index, coloring[d] = divmod(index, k)
         return coloring
+
+    def _on_node_clicked(self, node_id: int):
+        """Show coloring info for a leaf or the partial coloring for an inner node."""
+        nodes = self._tree_nodes
+        state = nodes.state(node_id)
+        mw = self.main_window
+        if state != NEUTRAL:
+            # Leaf node - show complete coloring
+            coloring = self._coloring_map.get(node_id)
+            if coloring is None:
+                return
+            is_invalid = state == INVALID
+            conflicts = None
+            if is_invalid and mw:
+                conflicts = mw.find_conflict_edges(coloring)
+
+            # Show info panel
+            self.show_coloring_info(coloring, state == VIABLE, conflict=conflicts)
+
+            # Apply coloring to graph
+            if mw:
+                # Reset edge styles first (clears any previous conflict highlighting)
+                mw.graph_scene.reset_edge_styles()
+                mw.apply_coloring_to_graph(coloring)
+                # Then highlight conflicts if this is an invalid coloring
+                if is_invalid and conflicts:
+                    mw.highlight_conflict_edges(conflicts)
+        else:
+            # Inner node - show partial coloring
+            partial_coloring = self._get_partial_coloring(node_id)
+            if partial_coloring is not None:
+                self.show_partial_coloring_info(partial_coloring)
+
+                # Reset node and edge colors
+                if mw:
+                    mw.clear_graph_coloring()
     
     def clear_coloring_info(self):
         """Force clear the info panel."""
         self._info_panel.clear()
 
-    def clear_tree(self):
+    def clear_tree(self, invalidate_layout: bool = False):
+        """
+        Remove the tree from the scene.
+        invalidate_layout also drops the cached layouts, forcing the next build
+        to recompute its geometry.
+        """
+        if invalidate_layout:
+            self._layout_cache.clear()
+        # Abandon any build still in progress
+        self._build_generation += 1
+        self._pending_viable = None
+        self._tree_shape = None
+
         self.scene.clear()
-        self._node_items.clear()
-        self._edges.clear()
+        self._tree_nodes = None
+        self._tree_edges = None
         self._coloring_map.clear()
         self.clear_coloring_info()
 
-    def _compute_positions(self, num_nodes: int, k: int, top_margin: int, left_margin: int, right_margin: int, view_w: int, view_h: int) -> Tuple[List[List[TreeNode]], Dict[int, QPointF]]:
+    def _on_layout_ready(self, generation: int, layout):
         """
-        Build levels (list of nodes per depth) and compute positions (node_id -> QPointF).
-        Does not modify the scene. Also fills self._coloring_map for leaf nodes.
+        Receive the tree model and layout from the TreeLayoutWorker (UI thread),
+        cache it with its edge path and show it.
         """
-        levels, numeric_positions = compute_tree_model_levels_positions(num_nodes, k, self.base_gap, self.level_gap, top_margin)
-
-        positions: Dict[int, QPointF] = {}
-        for nid, (x, y) in numeric_positions.items():
-            positions[nid] = QPointF(x, y)
-
-        last_level = levels[-1]
-        for i, leaf in enumerate(last_level):
-            self._coloring_map[leaf.id] = self._leaf_index_to_coloring(i, k, num_nodes)
-
-        return levels, positions
-
-    def _draw_edges(self, positions: Dict[int, QPointF], levels: List[List[TreeNode]], k: int):
-        """Draw tree edges into the scene (keeps nodes on top)."""
-        pen = QPen(Theme.EDGE_TREE, 2)
-        for d in range(len(levels) - 1):
-            for parent in levels[d]:
-                parent_pos = positions[parent.id]
-                first_child_idx = parent.index_in_level * k
-                for j in range(k):
-                    child = levels[d + 1][first_child_idx + j]
-                    child_pos = positions[child.id]
-                    line = self.scene.addLine(
-                        parent_pos.x(), parent_pos.y(),
-                        child_pos.x(), child_pos.y(),
-                        pen
-                    )
-                    self._edges.append(line)
-
-    def _draw_nodes(self, positions: Dict[int, QPointF], levels: List[List[TreeNode]], num_nodes: int, k: int, viable_leaf_ids: Set[int]):
-        """Create TreeNodeItem instances and add them to the scene."""
-        for d in range(num_nodes + 1):
-            for node in levels[d]:
-                is_viable = (d == num_nodes) and (node.id in viable_leaf_ids)
-                is_invalid = (d == num_nodes) and (node.id not in viable_leaf_ids)
-
-                parent_item = None
-                if d > 0:
-                    parent_idx = node.index_in_level // k
-                    parent_node = levels[d - 1][parent_idx]
-                    parent_item = self._node_items.get(parent_node.id)
-
-                item = TreeNodeItem(node, radius=self.node_radius, is_viable=is_viable, is_invalid=is_invalid, parent_widget=self, parent_item=parent_item)
-                pos = positions[node.id]
-                item.setPos(pos)
-                self.scene.addItem(item)
-                self._node_items[node.id] = item
+        self._layout_workers.pop(generation, None)
+        if generation != self._build_generation:
+            return  # Superseded by a newer build or cleared
+
+        level_starts, (xs, ys), _ = layout
+        edge_path = self._edge_path(xs, ys, level_starts, self._tree_k)
+        cache = self._layout_cache
+        cache[self._layout_key] = (layout, edge_path)
+        while len(cache) > LAYOUT_CACHE_SIZE:
+            cache.popitem(last=False)
+        self._show_layout(layout, edge_path)
+
+    def _show_layout(self, layout, edge_path: QPainterPath):
+        """
+        Fill self._coloring_map for leaf nodes, then add the node and edge items.
+        """
+        level_starts, (xs, ys), leaf_colorings = layout
+
+        # Node ids run level by level, so the arrays are indexed by id
+        for leaf_id, coloring in zip(range(level_starts[-2], level_starts[-1]), leaf_colorings):
+            self._coloring_map.setdefault(leaf_id, coloring)
+
+        leaf_count = level_starts[-1] - level_starts[-2]
+        nodes = TreeBatchItem(xs, ys, level_starts, self.node_radius,
+                              inner_dots=leaf_count > INNER_NODE_DOT_MIN_LEAVES)
+
+        # Leaves start invalid; the ones found so far are viable
+        nodes.set_leaf_states(self._pending_viable.translate(_MASK_TO_STATE))
+        self._pending_viable = None
+
+        # Insert the items without per-insert change signals or repaints
+        self.setUpdatesEnabled(False)
+        self.scene.blockSignals(True)
+        try:
+            self.scene.addItem(nodes)
+            self._tree_nodes = nodes
+            self._draw_edges(edge_path)
+        finally:
+            self.scene.blockSignals(False)
+
+        # Fit view (the view follows sceneRectChanged, so signals are back on)
+        try:
+            self.scene.setSceneRect(self.scene.itemsBoundingRect().adjusted(-40, -40, 40, 40))
+            tree_pixel_width = (leaf_count - 1) * self.base_gap
+
+            if tree_pixel_width < self.viewport().width() * 1.2:
+                self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.viewport().update()
+
+        self.setFocus()
+
+    def _on_layout_error(self, generation: int, msg: str):
+        self._layout_workers.pop(generation, None)
+        if generation == self._build_generation:
+            print(f"[WARN] Tree layout failed: {msg}")
+            # Forget the shape so the next run builds the tree again
+            self.clear_tree()
+            self.layout_failed.emit(msg)
+
+    @staticmethod
+    def _edge_path(xs: Sequence[float], ys: Sequence[float], level_starts: List[int], k: int) -> QPainterPath:
+        """Every tree edge as one path."""
+        path = QPainterPath()
+        move_to, line_to = path.moveTo, path.lineTo
+        for d in range(len(level_starts) - 2):
+            child = level_starts[d + 1]
+            for parent in range(level_starts[d], level_starts[d + 1]):
+                px, py = xs[parent], ys[parent]
+                # Children of a parent are k consecutive ids on the next level
+                for _ in range(k):
+                    move_to(px, py)
+                    line_to(xs[child], ys[child])
+                    child += 1
+        return path
+
+    def _draw_edges(self, path: QPainterPath):
+        """Add the edge path to the scene as a single item, below the nodes."""
+        item = QGraphicsPathItem(path)
+        item.setPen(_EDGE_PEN)
+        item.setCacheMode(QGraphicsPathItem.DeviceCoordinateCache)
+        self.scene.addItem(item)
+        self._tree_edges = item
 
     def build_full_tree(self, num_nodes: int, k: int, viable_colorings: Optional[List[List[int]]] = None):
         """
         Build and draw a complete k-ary tree.
         viable_colorings: List of valid colorings to highlight as green leaves.
         Returns an indiciatior of whether the tree was rendered (False if skipped due to size).
+        The tree layout is computed on a worker thread and the items are added
+        when it reports back, so the scene is still empty when this returns,
+        unless the layout for this shape and viewport size is cached.
         """
         # Store tree parameters for partial coloring extraction
         self._tree_k = k
         self._tree_depth = num_nodes
+        leaf_count = k ** num_nodes if num_nodes >= 0 else 1
 
         # Safety cap to avoid freezing the UI on large trees
-        if num_nodes > 0 and (k ** num_nodes) > MAX_LEAVES_RENDER:
-            print(f"[WARN] Tree too large to render (k={k}, depth={num_nodes}, leaves={k**num_nodes}). Skipping.")
+        if num_nodes > 0 and leaf_count > MAX_LEAVES_RENDER:
+            print(f"[WARN] Tree too large to render (k={k}, depth={num_nodes}, leaves={leaf_count}). Skipping.")
             self.clear_tree()
             return False
 
@@ -250,7 +403,6 @@ class SearchTreeWidget(QGraphicsView):
         view_w = self.viewport().width()
         left_margin = TREE_MARGIN_LEFT
         right_margin = TREE_MARGIN_RIGHT
-        leaf_count = k ** num_nodes if num_nodes >= 0 else 1
 
         if leaf_count > 60:
             self.node_radius = NODE_RADIUS_SMALL
@@ -280,45 +432,103 @@ class SearchTreeWidget(QGraphicsView):
         if num_nodes < 0 or k < 1:
             return
 
-        levels, positions = self._compute_positions(num_nodes, k, top_margin, left_margin, right_margin, view_w, view_h)
-        
-        # Draw edges first (so nodes are on top)
-        self._draw_edges(positions, levels, k)
-
         # Determine which leaf nodes correspond to viable colorings
-        viable_leaf_ids: Set[int] = set()
+        mask = self._pending_viable = bytearray(leaf_count)
         if viable_colorings:
-            # Convert colorings (as lists of color assignments) to leaf node IDs
-            # A leaf node's position in the tree corresponds to a coloring:
-            # The leaf's index in the leaf list maps to a coloring assignment
-            for coloring in viable_colorings:
-                # Convert coloring to leaf index
-                # Each color value represents a choice at that depth level
-                leaf_index = self._coloring_to_leaf_index(coloring, k)
-                if leaf_index < len(levels[num_nodes]):
-                    viable_leaf_ids.add(levels[num_nodes][leaf_index].id)
-
-        # Draw nodes
-        self._draw_nodes(positions, levels, num_nodes, k, viable_leaf_ids)
-
-        # Fit view
-        self.scene.setSceneRect(self.scene.itemsBoundingRect().adjusted(-40, -40, 40, 40))
-        tree_pixel_width = (leaf_count - 1) * self.base_gap
-
-        if tree_pixel_width < self.viewport().width() * 1.2:
-            self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
-
-        self.setFocus()
+            # A leaf's index in the leaf level is its coloring read as a base-k number
+            for i in self._colorings_to_leaf_indices(viable_colorings, k, num_nodes):
+                if 0 <= i < leaf_count:
+                    mask[i] = 1
+
+        self._tree_shape = (num_nodes, k)
+
+        # The geometry depends only on the tree shape and the viewport size
+        key = (num_nodes, k, view_w, view_h)
+        cached = self._layout_cache.get(key)
+        if cached is not None:
+            self._layout_cache.move_to_end(key)
+            self._show_layout(*cached)
+            return True
+        self._layout_key = key
+
+        # Compute the layout off the UI thread; items are added in _on_layout_ready
+        worker = TreeLayoutWorker(self._build_generation, num_nodes, k, self.base_gap, self.level_gap, top_margin)
+        worker.signals.finished.connect(self._on_layout_ready, Qt.QueuedConnection)
+        worker.signals.error.connect(self._on_layout_error, Qt.QueuedConnection)
+        self._layout_workers[self._build_generation] = worker
+        QThreadPool.globalInstance().start(worker)
         return True
     
+    def has_tree_shape(self, num_nodes: int, k: int) -> bool:
+        """Whether the current (possibly still building) tree has this depth and branching."""
+        return self._tree_shape == (num_nodes, k)
+
+    def reset_viability(self):
+        """
+        Return every leaf to the not-viable state, keeping the tree itself.
+        Lets a re-run on an unchanged tree shape skip build_full_tree.
+        """
+        if self._pending_viable is not None:
+            self._pending_viable = bytearray(len(self._pending_viable))
+        if self._tree_nodes is not None:
+            self._tree_nodes.replace_state(VIABLE, INVALID)
+        self.clear_coloring_info()
+
     def mark_coloring_viable(self, coloring: List[int], k: int, depth: int):
         """
         Mark the leaf node corresponding to a coloring as viable (green).
         Call this in real-time as each coloring is found.
         """
-        node_id = self.get_leaf_node_id(coloring, k, depth)
-        if node_id in self._node_items:
-            self._node_items[node_id].set_viable(True)
+        self.mark_colorings_viable([coloring], k, depth)
+    
+    def mark_colorings_viable(self, colorings: List[List[int]], k: int, depth: int):
+        """
+        Mark the leaf nodes of several colorings as viable in one pass.
+        Used for batches of colorings reported by the KLEE worker.
+        """
+        node_ids = [self.get_leaf_node_id(c, k, depth) for c in colorings]
+        self._set_leaves_viable(node_ids)
+
+    def _set_leaves_viable(self, node_ids: List[int]):
+        nodes = self._tree_nodes
+        if nodes is None:
+            # Tree still being built; applied when the node item is created
+            mask = self._pending_viable
+            if mask is not None:
+                for node_id in node_ids:
+                    i = self._pending_index(node_id)
+                    if i >= 0:
+                        mask[i] = 1
+            return
+        leaves = nodes.leaf_range
+        nodes.set_states((i for i in node_ids if i in leaves), VIABLE)
+    
+    def _pending_index(self, node_id: int) -> int:
+        """Leaf index of node_id in the pending-viable mask, or -1 if it is not a leaf."""
+        mask = self._pending_viable
+        if mask is None:
+            return -1
+        _, first_leaf_id = self._get_leaf_math(self._tree_k, self._tree_depth)
+        i = node_id - first_leaf_id
+        return i if 0 <= i < len(mask) else -1
+
+    def apply_colorings_batch(self, colorings: List[List[int]], k: int, depth: int):
+        """
+        Mark a batch of found colorings as viable and store them for leaf clicks.
+        Each leaf id is computed once and the view repaints once for the batch.
+        """
+        coloring_map = self._coloring_map
+        node_ids = []
+        self.setUpdatesEnabled(False)
+        try:
+            for coloring in colorings:
+                node_id = self.get_leaf_node_id(coloring, k, depth)
+                coloring_map[node_id] = coloring
+                node_ids.append(node_id)
+            self._set_leaves_viable(node_ids)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.viewport().update()
     
     def mark_coloring_invalid(self, coloring: List[int], k: int, depth: int):
         """
@@ -326,8 +536,13 @@ class SearchTreeWidget(QGraphicsView):
         Call this for colorings that were explored but failed constraints.
         """
         node_id = self.get_leaf_node_id(coloring, k, depth)
-        if node_id in self._node_items:
-            self._node_items[node_id].set_invalid(True)
+        nodes = self._tree_nodes
+        if nodes is None:
+            i = self._pending_index(node_id)
+            if i >= 0:
+                self._pending_viable[i] = 0
+        elif node_id in nodes.leaf_range:
+            nodes.set_state(node_id, INVALID)
     
     def store_coloring(self, leaf_node_id: int, coloring: List[int]):
         """Store the coloring data for a leaf node so we can display it when clicked."""
@@ -337,7 +552,7 @@ class SearchTreeWidget(QGraphicsView):
         """Handle click on a viable leaf node."""
         if node_id in self._coloring_map:
             coloring = self._coloring_map[node_id]
-            is_valid = node_id in self._node_items and self._node_items[node_id].is_viable
+            is_valid = self._tree_nodes is not None and self._tree_nodes.state(node_id) == VIABLE
             self.show_coloring_info(coloring, is_valid, conflict=None)
             self.leaf_clicked.emit(node_id, coloring)
 
@@ -367,45 +582,82 @@ class SearchTreeWidget(QGraphicsView):
 
         # Pan
         if key == Qt.Key_Left:
-            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - self._pan_step)
+            self._queue_pan(-self._pan_step, 0)
             event.accept()
             return
         if key == Qt.Key_Right:
-            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() + self._pan_step)
+            self._queue_pan(self._pan_step, 0)
             event.accept()
             return
         if key == Qt.Key_Up:
-            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - self._pan_step)
+            self._queue_pan(0, -self._pan_step)
             event.accept()
             return
         if key == Qt.Key_Down:
-            self.verticalScrollBar().setValue(self.verticalScrollBar().value() + self._pan_step)
+            self._queue_pan(0, self._pan_step)
             event.accept()
             return
 
         super().keyPressEvent(event)
 
+    def _queue_pan(self, dx: int, dy: int):
+        self._pan_dx += dx
+        self._pan_dy += dy
+        if not self._pan_timer.isActive():
+            self._pan_timer.start()
+
+    def _flush_pan(self):
+        """Scroll by all arrow-key pans queued since the last flush."""
+        if self._pan_dx:
+            bar = self.horizontalScrollBar()
+            bar.setValue(bar.value() + self._pan_dx)
+        if self._pan_dy:
+            bar = self.verticalScrollBar()
+            bar.setValue(bar.value() + self._pan_dy)
+        self._pan_dx = 0
+        self._pan_dy = 0
+
     def _apply_zoom(self, zoom_in: bool):
         # Clamp zoom to avoid going crazy
-        if zoom_in and self._zoom >= 30:
+        target = self._zoom + self._pending_zoom
+        if zoom_in and target >= 30:
             return
-        if (not zoom_in) and self._zoom <= -15:
+        if (not zoom_in) and target <= -15:
             return
 
-        factor = self._zoom_step if zoom_in else (1 / self._zoom_step)
-        self.scale(factor, factor)
-        self._zoom += 1 if zoom_in else -1
+        self._pending_zoom += 1 if zoom_in else -1
+        if not self._zoom_timer.isActive():
+            self._zoom_timer.start()
+
+    def _flush_zoom(self):
+        """Apply all zoom steps queued since the last flush as one scale."""
+        steps = self._pending_zoom
+        self._pending_zoom = 0
+        if steps:
+            factor = self._zoom_step ** steps
+            self.scale(factor, factor)
+            self._zoom += steps
 
     def reset_view(self):
+        # Drop pans and zoom steps queued before the reset
+        self._pan_timer.stop()
+        self._zoom_timer.stop()
+        self._pan_dx = self._pan_dy = self._pending_zoom = 0
         self._zoom = 0
         self.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
 
     def mousePressEvent(self, event):
-        """Clear panel when clicking on empty space."""
-        item = self.itemAt(event.pos())
-        if item is None:
+        """Dispatch clicks on tree nodes; clear the panel when clicking on empty space."""
+        node_id = None
+        if self._tree_nodes is not None:
+            pos = self.mapToScene(event.pos())
+            node_id = self._tree_nodes.node_at(pos.x(), pos.y())
+            self._tree_nodes.set_selected_node(node_id)
+        if node_id is None:
             self.clear_coloring_info()
             if self.main_window:
                 self.main_window.clear_graph_coloring()
+        else:
+            self._on_node_clicked(node_id)
         
         super().mousePressEvent(event)
@@ -1,25 +1,74 @@
+from typing import Tuple
+
 from PyQt5.QtWidgets import QFileDialog
 
 class CodeGenerator:
+    """
+    Builds the KLEE C program for a graph coloring problem.
+    The program is a prefix (constants, edges and constraints) followed by the
+    blocked-colorings clause; only the BLOCKED define inside the prefix header
+    depends on the blocked colorings. The prefix and the blocked rows are cached,
+    so update() only rebuilds what changed; c_code is regenerated lazily on access.
+    """
+
     def __init__(self, num_nodes = 0, edges = [], num_colors = 0, blocked = None):
         self.num_nodes = num_nodes
         self.edges = edges
         self.num_edges = len(edges)
         self.num_colors = num_colors
-        self.blocked = blocked or []
-
-        self.c_code = self.generate_code()
+        self.blocked = list(blocked or [])
+
+        # Cached sections, None when stale
+        self._prefix = None
+        self._blocked_rows = []  # one "{c0, c1, ...}" row per blocked coloring
+        self._c_code = None
+
+    def update(self, num_nodes = None, edges = None, num_colors = None, blocked = None):
+        """
+        Change some inputs, keeping the sections that do not depend on them.
+        Blocked colorings that extend the previous list only format the new rows.
+        """
+        if num_nodes is not None and num_nodes != self.num_nodes:
+            self.num_nodes = num_nodes
+            self._prefix = None
+            self._c_code = None
+        if num_colors is not None and num_colors != self.num_colors:
+            self.num_colors = num_colors
+            self._prefix = None
+            self._c_code = None
+        if edges is not None and edges != self.edges:
+            self.edges = edges
+            self.num_edges = len(edges)
+            self._prefix = None
+            self._c_code = None
+        if blocked is not None and blocked != self.blocked:
+            old = len(self.blocked)
+            if len(blocked) < old or blocked[:old] != self.blocked:
+                self._blocked_rows = []
+            self.blocked = list(blocked)
+            self._c_code = None
+
+    @property
+    def c_code(self) -> str:
+        if self._c_code is None:
+            self._c_code = self.generate_code()
+        return self._c_code
+
+    @staticmethod
+    def build_prefix(num_nodes, edges, num_colors) -> Tuple[str, str]:
+        """
+        The part of the program that does not depend on blocked colorings, as
+        (header, body). The BLOCKED define goes between the two.
+        """
+        header = [
+            "#include <klee/klee.h>",
+            "",
+            f"#define NODES {num_nodes}",
+            f"#define COLORS {num_colors}",
+            f"#define EDGES {len(edges)}",
+        ]
 
-    def generate_code(self):
         lines = []
-
-        lines.append("#include <klee/klee.h>")
-        lines.append("")
-
-        lines.append(f"#define NODES {self.num_nodes}")
-        lines.append(f"#define COLORS {self.num_colors}")
-        lines.append(f"#define EDGES {self.num_edges}")
-        lines.append(f"#define BLOCKED {len(self.blocked)}")
         lines.append("")
 
         lines.append("int main() {")
@@ -29,9 +78,8 @@ class CodeGenerator:
         lines.append("")
 
         lines.append("    int edges[EDGES][2] = {")
-        for i, (u, v) in enumerate(self.edges):
-            comma = "," if i < self.num_edges - 1 else ""
-            lines.append(f"        {{{u}, {v}}}{comma}")
+        if edges:
+            lines.append(",\n".join(f"        {{{u}, {v}}}" for u, v in edges))
         lines.append("    };")
         lines.append("")
 
@@ -55,14 +103,27 @@ class CodeGenerator:
         lines.append("    }")
         lines.append("")
 
+        return "\n".join(header) + "\n", "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _format_blocked_row(coloring) -> str:
+        values = ", ".join(str(c) for c in coloring)
+        return f"        {{{values}}}"
+
+    @classmethod
+    def build_blocked_clause(cls, blocked) -> str:
+        """The blocked colorings and the rest of main() that follows the prefix."""
+        return cls._blocked_clause(len(blocked), ",\n".join(map(cls._format_blocked_row, blocked)))
+
+    @staticmethod
+    def _blocked_clause(count: int, rows: str) -> str:
+        lines = []
+
         # Block previous colorings
-        if self.blocked:
+        if count:
             lines.append("    // Block previously found colorings")
             lines.append("    int blocked[BLOCKED][NODES] = {")
-            for i, coloring in enumerate(self.blocked):
-                comma = "," if i < len(self.blocked) - 1 else ""
-                values = ", ".join(str(c) for c in coloring)
-                lines.append(f"        {{{values}}}{comma}")
+            lines.append(rows)
             lines.append("    };")
             lines.append("")
 
@@ -90,6 +151,21 @@ class CodeGenerator:
 
         return "\n".join(lines)
 
+    def _get_prefix(self) -> Tuple[str, str]:
+        if self._prefix is None:
+            self._prefix = self.build_prefix(self.num_nodes, self.edges, self.num_colors)
+        return self._prefix
+
+    def _get_blocked_rows(self) -> str:
+        rows = self._blocked_rows
+        rows.extend(map(self._format_blocked_row, self.blocked[len(rows):]))
+        return ",\n".join(rows)
+
+    def generate_code(self):
+        header, body = self._get_prefix()
+        count = len(self.blocked)
+        return header + f"#define BLOCKED {count}\n" + body + self._blocked_clause(count, self._get_blocked_rows())
+
 
     def save_to_file(self, parent = None):
         file_path, _ = QFileDialog.getSaveFileName(
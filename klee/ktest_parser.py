@@ -1,5 +1,7 @@
 import subprocess
 import re
+import io
+import sys
 import shutil
 import ast
 import struct
@@ -146,19 +148,24 @@ class KTestParser:
         self.results: List[KTestResult] = self._parse_all()
     
     def _parse_all(self) -> List[KTestResult]:
-        """Parse all .ktest files using list comprehension with walrus operator."""
-        return [
+        """Parse all .ktest files; warnings are written to stdout in one go at the end."""
+        log = io.StringIO()
+        results = [
             result for ktest_path in sorted(self.klee_out_dir.glob("*.ktest"))
-            if (result := self._parse_single_ktest(ktest_path))
+            if (result := self._parse_single_ktest(ktest_path, log))
         ]
+        if log.tell():
+            sys.stdout.write(log.getvalue())
+            sys.stdout.flush()
+        return results
 
     @staticmethod
-    def _parse_single_ktest(ktest_path: Path) -> Optional[KTestResult]:
+    def _parse_single_ktest(ktest_path: Path, log: io.StringIO) -> Optional[KTestResult]:
         """Parse a single .ktest file, returning None on error."""
         try:
             return parse_ktest_file(str(ktest_path))
         except Exception as e:
-            print(f"[WARN] Error while parsing {ktest_path}: {e}")
+            log.write(f"[WARN] Error while parsing {ktest_path}: {e}\n")
             return None
         
     def get_all_colorings(self, num_nodes: int) -> List[List[int]]:
@@ -1,6 +1,8 @@
+import copy
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
 from enum import Enum, auto
+from weakref import WeakValueDictionary
 
 
 class Tool(Enum):
@@ -10,25 +12,27 @@ class Tool(Enum):
     ADD_EDGE = auto()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Node:
-    """Represents a graph node."""
+    """
+    Represents a graph node.
+    Immutable; use dataclasses.replace() to get a moved or recolored node.
+    """
     id: int
     x: float
     y: float
     color: int = -1  # -1 means uncolored
     
+    def __hash__(self) -> int:
+        return hash(self.id)
+
     def position(self) -> Tuple[float, float]:
         return (self.x, self.y)
-    
-    def set_position(self, x: float, y: float):
-        self.x = x
-        self.y = y
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Edge:
-    """Represents a graph edge."""
+    """Represents a graph edge. Immutable, so it can be shared between states."""
     source: int
     target: int
     
@@ -48,6 +52,33 @@ class Edge:
         raise ValueError(f"Node {node_id} is not connected by this edge")
 
 
+# Hash-consing tables for the Node/Edge objects held by GraphStates.
+# Consecutive snapshots are mostly identical, so equal values share a single
+# object; entries disappear once no snapshot references them.
+_NODE_TABLE: 'WeakValueDictionary[Tuple[int, float, float, int], Node]' = WeakValueDictionary()
+_EDGE_TABLE: 'WeakValueDictionary[Tuple[int, int], Edge]' = WeakValueDictionary()
+
+
+def intern_node(node_id: int, x: float, y: float, color: int = -1) -> Node:
+    """Get the shared Node for these values."""
+    key = (node_id, x, y, color)
+    node = _NODE_TABLE.get(key)
+    if node is None:
+        node = Node(node_id, x, y, color)
+        _NODE_TABLE[key] = node
+    return node
+
+
+def intern_edge(source: int, target: int) -> Edge:
+    """Get the shared Edge for these endpoints."""
+    key = (source, target)
+    edge = _EDGE_TABLE.get(key)
+    if edge is None:
+        edge = Edge(source, target)
+        _EDGE_TABLE[key] = edge
+    return edge
+
+
 @dataclass
 class GraphState:
     """
@@ -57,16 +88,139 @@ class GraphState:
     nodes: List[Node] = field(default_factory=list)
     edges: List[Edge] = field(default_factory=list)
     next_node_id: int = 0
+    # Names of list fields shared with another state (copy-on-write)
+    _shared: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    # Memoized content hash, reset whenever apply() modifies the state
+    _hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((
+                tuple((n.id, n.x, n.y, n.color) for n in self.nodes),
+                tuple(self.edges),
+                self.next_node_id
+            ))
+        return self._hash
+
+    @classmethod
+    def capture(cls, nodes: Iterable[Node], edges: Iterable[Edge], next_node_id: int) -> 'GraphState':
+        """Snapshot live nodes/edges; both are frozen, so they are shared by reference."""
+        return cls(
+            nodes=list(nodes),
+            edges=list(edges),
+            next_node_id=next_node_id
+        )
     
     def copy(self) -> 'GraphState':
-        return GraphState(
-            nodes=[Node(n.id, n.x, n.y, n.color) for n in self.nodes],
-            edges=[Edge(e.source, e.target) for e in self.edges],
-            next_node_id=self.next_node_id
-        )
+        """
+        Lazy copy: both states share the node/edge lists until one of them
+        is modified through apply(), which then copies only the touched list.
+        Node/Edge objects held by a GraphState are never mutated in place.
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.nodes = self.nodes
+        new.edges = self.edges
+        new.next_node_id = self.next_node_id
+        new._shared = {"nodes", "edges"}
+        new._hash = self._hash
+        self._shared = {"nodes", "edges"}
+        return new
+
+    def _writable(self, name: str) -> list:
+        """Get a list field for modification, copying it first if shared."""
+        if name in self._shared:
+            setattr(self, name, list(getattr(self, name)))
+            self._shared.discard(name)
+        return getattr(self, name)
+
+    def __deepcopy__(self, memo: dict) -> 'GraphState':
+        # Register the new instance before copying children so shared
+        # sub-objects (and cycles back to this state) are copied only once
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        new.nodes = copy.deepcopy(self.nodes, memo)
+        new.edges = copy.deepcopy(self.edges, memo)
+        new.next_node_id = self.next_node_id
+        new._shared = set()
+        new._hash = self._hash
+        return new
+
+    def apply(self, op: tuple) -> 'GraphState':
+        """
+        Apply a single edit operation in place and return self.
+
+        Operations are plain tuples:
+            ("add_node", node, index)        index None appends
+            ("remove_node", node_id)
+            ("move_node", node_id, x, y)
+            ("add_edge", source, target, index)
+            ("remove_edge", source, target)
+            ("next_node_id", value)
+            ("restore", state)               replace everything with a copy of state
+            ("batch", (op, ...))             apply ops in order
+        """
+        kind = op[0]
+        self._hash = None
+        if kind == "batch":
+            for sub_op in op[1]:
+                self.apply(sub_op)
+        elif kind == "add_node":
+            _, node, index = op
+            if index is None:
+                self._writable("nodes").append(node)
+            else:
+                self._writable("nodes").insert(index, node)
+        elif kind == "remove_node":
+            i = self._node_index(op[1])
+            del self._writable("nodes")[i]
+        elif kind == "move_node":
+            _, node_id, x, y = op
+            i = self._node_index(node_id)
+            old = self.nodes[i]
+            self._writable("nodes")[i] = intern_node(old.id, x, y, old.color)
+        elif kind == "add_edge":
+            _, source, target, index = op
+            if index is None:
+                self._writable("edges").append(intern_edge(source, target))
+            else:
+                self._writable("edges").insert(index, intern_edge(source, target))
+        elif kind == "remove_edge":
+            i = self._edge_index(op[1], op[2])
+            del self._writable("edges")[i]
+        elif kind == "next_node_id":
+            self.next_node_id = op[1]
+        elif kind == "restore":
+            snapshot = op[1].copy()
+            self.nodes = snapshot.nodes
+            self.edges = snapshot.edges
+            self.next_node_id = snapshot.next_node_id
+            self._shared = snapshot._shared
+        else:
+            raise ValueError(f"Unknown edit operation: {kind}")
+        return self
+
+    def _node_index(self, node_id: int) -> int:
+        for i, n in enumerate(self.nodes):
+            if n.id == node_id:
+                return i
+        raise ValueError(f"Node {node_id} is not in this state")
+
+    def _edge_index(self, source: int, target: int) -> int:
+        for i, e in enumerate(self.edges):
+            if e.source == source and e.target == target:
+                return i
+        raise ValueError(f"Edge ({source}, {target}) is not in this state")
+
 
 @dataclass
-class TreeNode:
-    id: int
-    depth: int
-    index_in_level: int
\ No newline at end of file
+class GraphEdit:
+    """
+    A single undoable edit.
+    forward/inverse are GraphState.apply operations; checkpoint optionally
+    holds the full state right after the edit, used to recover if replaying
+    the operations ever fails.
+    """
+    kind: str
+    forward: tuple
+    inverse: tuple
+    checkpoint: Optional[GraphState] = None
\ No newline at end of file
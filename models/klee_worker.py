@@ -5,15 +5,15 @@ import logging
 import threading
 
 from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, pyqtSlot
-from klee.runner import KleeRunner
-from klee.ktest_parser import KTestParser
-from klee.code_generator import CodeGenerator
 
 logger = logging.getLogger(__name__)
 
+# Max colorings per found_batch emission
+FOUND_BATCH_SIZE = 32
+
 class KleeWorkerSignals(QObject):
-    found = pyqtSignal(list)      # Single coloring found
-    finished = pyqtSignal(list)   # All colorings
+    found_batch = pyqtSignal(list)  # Colorings found since the last batch
+    finished = pyqtSignal(int)    # Number of colorings found (already sent in batches)
     error = pyqtSignal(str)
     cancelled = pyqtSignal()
 
@@ -44,25 +44,34 @@ class KleeWorker(QRunnable):
 
     @pyqtSlot()
     def run(self):
+        # The klee package is only needed once a run starts
+        from klee.runner import KleeRunner
+        from klee.ktest_parser import KTestParser
+        from klee.code_generator import CodeGenerator
+
+        # One C file for the whole run, rewritten in place each iteration
+        fd, c_file = tempfile.mkstemp(suffix='.c')
         try:
-            blocked = []
-            all_colorings = []
+            blocked = []  # Every coloring found so far, in generation order
+            blocked_set = set()  # The same colorings as tuples, for membership tests
             iteration = 0
 
+            # Graph sections are generated once; each iteration only adds blocked rows
+            gen = CodeGenerator(
+                num_nodes=self.num_nodes,
+                edges=self.edges,
+                num_colors=self.num_colors
+            )
+
             while not self.is_cancelled():
                 iteration += 1
                 logger.info("KLEE iteration %d", iteration)
 
-                gen = CodeGenerator(
-                    num_nodes=self.num_nodes,
-                    edges=self.edges,
-                    num_colors=self.num_colors,
-                    blocked=blocked
-                )
+                gen.update(blocked=blocked)
 
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.c', delete=False) as f:
-                    f.write(gen.c_code)
-                    c_file = f.name
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, gen.c_code.encode())
 
                 try:
                     if self.is_cancelled():
@@ -76,33 +85,43 @@ class KleeWorker(QRunnable):
 
                     colorings = KTestParser(str(result.klee_out_dir)).get_all_colorings(self.num_nodes)
 
-                    new = [c for c in colorings if c not in blocked]
+                    new = [c for c in colorings if tuple(c) not in blocked_set]
                     if not new:
                         logger.info("No new colorings found, finishing")
                         break
 
+                    # One queued signal per batch instead of one per coloring
+                    batch = []
                     for c in new:
                         if self.is_cancelled():
                             break
                         blocked.append(c)
-                        all_colorings.append(c)
-                        self.signals.found.emit(c)
+                        blocked_set.add(tuple(c))
+                        batch.append(c)
+                        if len(batch) >= FOUND_BATCH_SIZE:
+                            self.signals.found_batch.emit(batch)
+                            batch = []
+                    if batch and not self.is_cancelled():
+                        self.signals.found_batch.emit(batch)
 
                 finally:
                     self._runner = None
-                    try:
-                        os.unlink(c_file)
-                    except Exception:
-                        pass
 
             if self.is_cancelled():
                 logger.info("KLEE worker cancelled")
                 self.signals.cancelled.emit()
                 return
 
-            self.signals.finished.emit(all_colorings)
+            self.signals.finished.emit(len(blocked))
 
         except Exception as e:
             if not self.is_cancelled():
                 logger.exception("KLEE worker error")
-                self.signals.error.emit(str(e))
\ No newline at end of file
+                self.signals.error.emit(str(e))
+
+        finally:
+            os.close(fd)
+            try:
+                os.unlink(c_file)
+            except OSError:
+                pass
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from PyQt5.QtGui import QColor, QFont
 from PyQt5.QtCore import Qt
 from typing import List
@@ -22,6 +23,15 @@ TREE_MARGIN_RIGHT = 40
 
 MAX_LEAVES_RENDER = 2000
 
+# Above this many leaves, inner tree nodes are drawn as small unlabeled dots
+INNER_NODE_DOT_MIN_LEAVES = 30
+INNER_NODE_DOT_RADIUS = 3
+
+# Render the search tree view through OpenGL when a context can be created
+TREE_VIEW_OPENGL = True
+# Multisampling samples for the OpenGL viewport (antialiasing)
+TREE_VIEW_GL_SAMPLES = 4
+
 # Node and Edge Appearance
 # For graph editing panel
 NODE_RADIUS = 22 
@@ -29,6 +39,11 @@ NODE_BORDER_WIDTH = 3
 EDGE_WIDTH = 3
 HIGHLIGHT_EDGE_WIDTH = EDGE_WIDTH + 2
 
+# Graph scene spatial index: drop the BSP index above NO_INDEX_NODE_THRESHOLD
+# nodes, restore it below BSP_INDEX_NODE_THRESHOLD (hysteresis)
+NO_INDEX_NODE_THRESHOLD = 2000
+BSP_INDEX_NODE_THRESHOLD = 1500
+
 COLORING_PALETTE: List[QColor] = [
     QColor("#E53935"),  # Red
     QColor("#1E88E5"),  # Blue
@@ -164,6 +179,10 @@ class Styles:
     
     @staticmethod
     def main_window():
+        """
+        Window-level stylesheet: widgets pick their rules up by objectName,
+        so Qt parses the CSS once instead of once per widget.
+        """
         return f"""
             QMainWindow {{
                 background-color: {Theme.BG_PRIMARY.name()};
@@ -171,91 +190,68 @@ class Styles:
             QLabel {{
                 color: {Theme.TEXT_PRIMARY.name()};
             }}
-        """
-    
-    @staticmethod
-    def panel():
-        return f"""
-            QFrame {{
+
+            QFrame#panelFrame, QFrame#panelFrame QFrame {{
                 background-color: {Theme.BG_PANEL.name()};
                 border-radius: {Dimensions.PANEL_BORDER_RADIUS}px;
             }}
-        """
-    
-    @staticmethod
-    def canvas():
-        return f"""
-            QGraphicsView {{
-                border: 2px solid {Theme.BORDER_LIGHT.name()};
-                border-radius: {Dimensions.CANVAS_BORDER_RADIUS}px;
-                background-color: {Theme.BG_CANVAS.name()};
+            QLabel#titleLabel {{
+                color: {Theme.TEXT_PRIMARY.name()};
+                margin-bottom: 5px;
             }}
-        """
-    
-    @staticmethod
-    def tool_button():
-        return f"""
-            QPushButton {{
+            QLabel#colorsLabel {{
+                color: #333333;
+                font-size: 16px;
+            }}
+
+            QPushButton#toolButton {{
                 background-color: {Theme.BG_PRIMARY.name()};
                 border: 2px solid {Theme.BORDER_LIGHT.name()};
                 border-radius: 8px;
                 font-size: 16px;
                 font-weight: bold;
             }}
-            QPushButton:hover {{
+            QPushButton#toolButton:hover {{
                 background-color: {Theme.HOVER_BG.name()};
                 border-color: {Theme.ACCENT_PRIMARY.name()};
             }}
-            QPushButton:checked {{
+            QPushButton#toolButton:checked {{
                 background-color: {Theme.ACCENT_PRIMARY.name()};
                 color: white;
                 border-color: {Theme.ACCENT_PRIMARY.darker(120).name()};
             }}
-            QPushButton:pressed {{
+            QPushButton#toolButton:pressed {{
                 background-color: {Theme.PRESSED_BG.name()};
             }}
-        """
-    
-    @staticmethod
-    def action_button_primary():
-        return f"""
-            QPushButton {{
-                background-color: {Theme.ACCENT_SUCCESS.name()};
+
+            QPushButton#actionPrimary, QPushButton#actionSecondary {{
                 color: white;
                 border: none;
                 border-radius: 10px;
             }}
-            QPushButton:hover {{
+            QPushButton#actionPrimary {{
+                background-color: {Theme.ACCENT_SUCCESS.name()};
+            }}
+            QPushButton#actionPrimary:hover {{
                 background-color: {Theme.ACCENT_SUCCESS.darker(110).name()};
             }}
-            QPushButton:pressed {{
+            QPushButton#actionPrimary:pressed {{
                 background-color: {Theme.ACCENT_SUCCESS.darker(120).name()};
             }}
-            QPushButton:disabled {{
+            QPushButton#actionPrimary:disabled {{
                 background-color: {Theme.ACCENT_SUCCESS.lighter(150).name()};
             }}
-        """
-    
-    @staticmethod
-    def action_button_secondary():
-        return f"""
-            QPushButton {{
+            QPushButton#actionSecondary {{
                 background-color: {Theme.ACCENT_PRIMARY.name()};
-                color: white;
-                border: none;
-                border-radius: 10px;
             }}
-            QPushButton:hover {{
+            QPushButton#actionSecondary:hover {{
                 background-color: {Theme.ACCENT_PRIMARY.darker(110).name()};
             }}
-            QPushButton:pressed {{
+            QPushButton#actionSecondary:pressed {{
                 background-color: {Theme.ACCENT_PRIMARY.darker(120).name()};
             }}
-        """
-    
-    def spin_box():
-        return """
-            QSpinBox {
+
+            QSpinBox#colorsSpin {{
                 font-size: 18px;
                 font-weight: bold;
                 color: #000000;
@@ -263,43 +259,47 @@ class Styles:
                 border: 2px solid #CCCCCC;
                 border-radius: 8px;
                 background: #FFFFFF;
-            }
-
-            QSpinBox:focus {
+            }}
+            QSpinBox#colorsSpin:focus {{
                 border-color: #2196F3;
-            }
-
-            QSpinBox::up-button {
+            }}
+            QSpinBox#colorsSpin::up-button {{
                 width: 20px;
                 border-left: 1px solid #CCCCCC;
                 border-bottom: 1px solid #CCCCCC;
                 background: #F5F5F5;
                 border-top-right-radius: 6px;
-            }
-
-            QSpinBox::down-button {
+            }}
+            QSpinBox#colorsSpin::down-button {{
                 width: 20px;
                 border-left: 1px solid #CCCCCC;
                 background: #F5F5F5;
                 border-bottom-right-radius: 6px;
-            }
-
-            QSpinBox::up-button:hover,
-            QSpinBox::down-button:hover {
+            }}
+            QSpinBox#colorsSpin::up-button:hover,
+            QSpinBox#colorsSpin::down-button:hover {{
                 background: #E3F2FD;
-            }
-
-            QSpinBox::up-arrow {
+            }}
+            QSpinBox#colorsSpin::up-arrow {{
                 image: url(icons/up.png);
                 width: 10px;
                 height: 10px;
-            }
-
-            QSpinBox::down-arrow {
+            }}
+            QSpinBox#colorsSpin::down-arrow {{
                 image: url(icons/down.svg);
                 width: 10px;
                 height: 10px;
-            }
+            }}
+        """
+    
+    @staticmethod
+    def canvas():
+        return f"""
+            QGraphicsView {{
+                border: 2px solid {Theme.BORDER_LIGHT.name()};
+                border-radius: {Dimensions.CANVAS_BORDER_RADIUS}px;
+                background-color: {Theme.BG_CANVAS.name()};
+            }}
         """
     
     @staticmethod
@@ -313,15 +313,12 @@ class Styles:
             }
         """
     
-    @staticmethod
-    def label_title():
-        return f"color: {Theme.TEXT_PRIMARY.name()}; margin-bottom: 5px;"
-    
     @staticmethod
     def label_info():
         return f"color: {Theme.TEXT_SECONDARY.name()}; font-size: 12px;"
 
 
+@lru_cache(maxsize=None)
 def get_color_name(color_index: int) -> str:
     """
     Get the name of a color by its index.
@@ -332,10 +329,12 @@ def get_color_name(color_index: int) -> str:
     return f"COLOR_{color_index}"
 
 
+@lru_cache(maxsize=None)
 def get_display_color(color_index: int) -> QColor:
     """
     Get the display QColor for a color index.
     Used by ColoringInfoPanel to show colored circles.
+    The returned QColor is shared between callers - copy before modifying.
     """
     if 0 <= color_index < len(COLORING_PALETTE):
         return COLORING_PALETTE[color_index]
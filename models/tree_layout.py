@@ -1,6 +1,7 @@
-from typing import Dict, List, Tuple
+from array import array
+from itertools import repeat
+from typing import List, Tuple
 
-from models.graph import TreeNode
 
 
 def compute_first_leaf_id(depth: int, k: int) -> int:
@@ -16,50 +17,72 @@ def compute_first_leaf_id(depth: int, k: int) -> int:
     return (k ** depth - 1) // (k - 1)
 
 
-def compute_tree_model_levels_positions(
+def compute_level_starts(depth: int, k: int) -> List[int]:
+    """
+    First node id of every level of a complete k-ary tree, followed by the node count.
+    Ids are assigned level by level, so level d holds ids starts[d] .. starts[d + 1] - 1
+    and the children of the i-th node of level d are k consecutive ids from starts[d + 1] + i * k.
+    """
+    if depth < 0 or k < 1:
+        raise ValueError("Depth must be >=0 and k must be >=1")
+
+    starts = [0]
+    count = 1  # k ** d
+    for _ in range(depth + 1):
+        starts.append(starts[-1] + count)
+        count *= k
+    return starts
+
+
+def compute_tree_positions(
     depth: int,
     k: int,
     base_gap: float,
     level_gap: float,
     top_margin: float,
-) -> Tuple[List[List[TreeNode]], Dict[int, Tuple[float, float]]]:
+) -> Tuple[array, array]:
     """
-    Builds a complete k-ary tree model (levels of TreeNode) and computes numeric positions (node_id -> (x, y)).
+    Computes node positions of a complete k-ary tree as flat arrays (xs, ys)
+    indexed by node id (ids assigned level by level).
+    Leaves are evenly spaced and every internal node sits at the average x of its
+    children, which for equal spacing is the middle of the leaves below it.
     """
     if depth < 0 or k < 1:
         raise ValueError("Depth must be >=0 and k must be >=1")
 
-    levels: List[List[TreeNode]] = []
-    node_id = 0
-
-    for d in range(depth + 1):
-        count = k ** d
-        level_nodes: List[TreeNode] = []
-        for idx in range(count):
-            level_nodes.append(TreeNode(id=node_id, depth=d, index_in_level=idx))
-            node_id += 1
-        levels.append(level_nodes)
-
-    # Compute leaf layout
-    leaf_count = len(levels[-1])
+    leaf_count = k ** depth
     width = max(1, leaf_count - 1) * base_gap
     x0 = -width / 2.0
 
-    positions: Dict[int, Tuple[float, float]] = {}
+    xs = array('d')
+    ys = array('d')
+    count = 1  # Nodes at depth d, k ** d
+    for d in range(depth + 1):
+        # Each node at depth d covers span consecutive leaves
+        span = leaf_count // count
+        offset = x0 + (span - 1) * base_gap / 2.0
+        step = span * base_gap
+        xs.extend(offset + i * step for i in range(count))
+        ys.extend(repeat(top_margin + d * level_gap, count))
+        count *= k
+
+    return xs, ys
 
-    # Place leaves evenly
-    for i, leaf in enumerate(levels[-1]):
-        x = x0 + i * base_gap
-        y = top_margin + depth * level_gap
-        positions[leaf.id] = (x, y)
 
-    # Place internal nodes as average of children x
-    for d in range(depth - 1, -1, -1):
-        for node in levels[d]:
-            first_child_idx = node.index_in_level * k
-            child_ids = [levels[d + 1][first_child_idx + j].id for j in range(k)]
-            avg_x = sum(positions[cid][0] for cid in child_ids) / k
-            y = top_margin + d * level_gap
-            positions[node.id] = (avg_x, y)
+def compute_leaf_colorings(depth: int, k: int) -> List[List[int]]:
+    """
+    Colorings for all leaves of a complete k-ary tree, in leaf order.
+    Leaf i is the base-k representation of i with depth digits (most significant first).
+    """
+    if depth < 0 or k < 1:
+        raise ValueError("Depth must be >=0 and k must be >=1")
 
-    return levels, positions
+    colorings: List[List[int]] = []
+    for leaf_index in range(k ** depth):
+        coloring = [0] * depth
+        x = leaf_index
+        for d in range(depth - 1, -1, -1):
+            coloring[d] = x % k
+            x //= k
+        colorings.append(coloring)
+    return colorings
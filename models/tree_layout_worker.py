@@ -0,0 +1,40 @@
+import logging
+
+from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, pyqtSlot
+from models.tree_layout import compute_level_starts, compute_tree_positions, compute_leaf_colorings
+
+logger = logging.getLogger(__name__)
+
+class TreeLayoutWorkerSignals(QObject):
+    finished = pyqtSignal(int, object)  # build generation, (level starts, (xs, ys), leaf colorings)
+    error = pyqtSignal(int, str)        # build generation, message
+
+class TreeLayoutWorker(QRunnable):
+    """
+    Computes the search tree model and its layout off the UI thread.
+    Only plain Python data is built here; Qt items are created by the view.
+    """
+    def __init__(self, generation: int, depth: int, k: int, base_gap: float, level_gap: float, top_margin: float):
+        super().__init__()
+        self.signals = TreeLayoutWorkerSignals()
+        self.generation = generation
+        self.depth = depth
+        self.k = k
+        self.base_gap = base_gap
+        self.level_gap = level_gap
+        self.top_margin = top_margin
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            level_starts = compute_level_starts(self.depth, self.k)
+            positions = compute_tree_positions(
+                self.depth, self.k, self.base_gap, self.level_gap, self.top_margin
+            )
+            leaf_colorings = compute_leaf_colorings(self.depth, self.k)
+        except Exception as e:
+            logger.exception("Tree layout worker error")
+            self.signals.error.emit(self.generation, str(e))
+            return
+
+        self.signals.finished.emit(self.generation, (level_starts, positions, leaf_colorings))